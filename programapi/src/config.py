@@ -9,6 +9,33 @@ class Config:
     project_root = Path(__file__).resolve().parents[1]
     raw_path = Path(f"{project_root}/data/raw/{event}")
     public_path = Path(f"{project_root}/data/public/{event}")
+    cache_path = Path(f"{project_root}/data/cache/{event}")
+
+    # Can be pointed to a local stand-in server, see src/fake_pretalx.py
+    pretalx_api_url = os.getenv("PRETALX_API_URL", "https://pretalx.com/api")
+
+    # Maximum number of requests in flight while downloading from Pretalx
+    download_concurrency = int(os.getenv("DOWNLOAD_CONCURRENCY", 8))
+
+    # Number of processes parsing the raw files, see src/utils/parallel_parse.py
+    parse_workers = int(os.getenv("PARSE_WORKERS", os.cpu_count() or 1))
+
+    # Total size of the raw files below which they are parsed in the main process
+    parallel_parse_min_bytes = int(os.getenv("PARALLEL_PARSE_MIN_BYTES", 32 * 2**20))
+
+    # Number of sessions from which the timing relationships are computed with NumPy,
+    # if it is installed, see src/utils/numpy_timing.py
+    numpy_timing_threshold = int(os.getenv("NUMPY_TIMING_THRESHOLD", 500))
+
+    # Number of threads compressing the output files, see src/utils/compression.py
+    write_workers = int(os.getenv("WRITE_WORKERS", 8))
+
+    # Size of the output files below which they are not compressed, see
+    # src/utils/compression.py
+    compression_min_bytes = int(os.getenv("COMPRESSION_MIN_BYTES", 2048))
+
+    # Number of versions kept in the feed of the changes, see src/utils/delta_feed.py
+    delta_feed_size = int(os.getenv("DELTA_FEED_SIZE", 100))
 
     @classmethod
     def token(cls) -> str:
@@ -0,0 +1,71 @@
+import argparse
+from pathlib import Path
+
+from src.config import Config
+from src.misc import Room
+from src.utils.fake_pretalx import FakePretalx
+from src.utils.synthetic_event import SyntheticEvent
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve (or dump) a synthetic Pretalx event of any size"
+    )
+    parser.add_argument("--submissions", type=int, default=1000)
+    parser.add_argument("--speakers", type=int, default=None)
+    parser.add_argument(
+        "--rooms", type=int, choices=range(1, len(Room) + 1), default=len(Room)
+    )
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument(
+        "--tracks",
+        type=int,
+        default=None,
+        help="Sessions at the same time in every room (by default, as many as needed)",
+    )
+    parser.add_argument("--answers", type=int, default=3)
+    parser.add_argument("--workshop-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--page-size", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.0, help="In seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="In seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument(
+        "--dump",
+        type=Path,
+        default=None,
+        help="Write the raw *_latest.json files to this directory instead of serving them",
+    )
+    args = parser.parse_args()
+
+    event = SyntheticEvent(
+        submissions=args.submissions,
+        speakers=args.speakers,
+        rooms=args.rooms,
+        days=args.days,
+        tracks=args.tracks,
+        answers=args.answers,
+        workshop_ratio=args.workshop_ratio,
+        seed=args.seed,
+    )
+
+    if args.dump:
+        event.dump(args.dump)
+        print(f"Wrote the raw files to {args.dump}")
+        raise SystemExit(0)
+
+    fake = FakePretalx(
+        event.resources(),
+        event=Config.event,
+        page_size=args.page_size,
+        rate_limit_every=args.rate_limit_every,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        port=args.port,
+    )
+    print(f"Serving a fake Pretalx at {fake.url}")
+    print(f"Run: PRETALX_API_URL={fake.url.split('/events/')[0]} make all")
+    fake.server.serve_forever()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime
+from typing import ClassVar
 
 from pydantic import BaseModel, Field, computed_field, field_validator, model_validator
 
@@ -14,6 +15,9 @@ class EuroPythonSpeaker(BaseModel):
     Model for EuroPython speaker data, transformed from Pretalx data
     """
 
+    # How the lists are ordered in the output, see src/utils/serializer.py
+    list_order: ClassVar[dict[str, tuple[str, ...]]] = {"submissions": ()}
+
     code: str
     name: str
     biography: str | None = None
@@ -126,6 +130,14 @@ class EuroPythonSession(BaseModel):
     Model for EuroPython session data, transformed from Pretalx data
     """
 
+    # How the lists are ordered in the output, see src/utils/serializer.py
+    list_order: ClassVar[dict[str, tuple[str, ...]]] = {
+        "speakers": (),
+        "sessions_in_parallel": (),
+        "sessions_after": (),
+        "sessions_before": (),
+    }
+
     code: str
     title: str
     speakers: list[str]
@@ -205,6 +217,12 @@ class EuroPythonScheduleSession(BaseModel):
     Model for EuroPython schedule session data
     """
 
+    # How the lists are ordered in the output, see src/utils/serializer.py
+    list_order: ClassVar[dict[str, tuple[str, ...]]] = {
+        "speakers": ("code",),
+        "rooms": (),
+    }
+
     event_type: EventType = EventType.SESSION
     code: str
     slug: str
@@ -230,6 +248,9 @@ class EuroPythonScheduleBreak(BaseModel):
     Model for EuroPython schedule break data
     """
 
+    # How the lists are ordered in the output, see src/utils/serializer.py
+    list_order: ClassVar[dict[str, tuple[str, ...]]] = {"rooms": ()}
+
     event_type: EventType = EventType.BREAK
     title: str
     duration: int
@@ -238,6 +259,12 @@ class EuroPythonScheduleBreak(BaseModel):
 
 
 class DaySchedule(BaseModel):
+    # How the lists are ordered in the output, see src/utils/serializer.py
+    list_order: ClassVar[dict[str, tuple[str, ...]]] = {
+        "rooms": (),
+        "events": ("start", "code", "title"),
+    }
+
     rooms: list[Room]
     events: list[EuroPythonScheduleSession | EuroPythonScheduleBreak]
 
@@ -1,27 +1,20 @@
 from datetime import datetime
+from functools import cached_property
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import AliasPath, BaseModel, Field, field_validator, model_validator
 
 from src.misc import SubmissionState
 
 
 class PretalxAnswer(BaseModel):
-    question_text: str
-    answer_text: str
-    answer_file: str | None = None
-    submission_id: str | None = None
-    speaker_id: str | None = None
-
-    @model_validator(mode="before")
-    @classmethod
-    def extract(cls, values) -> dict:
-        values["question_text"] = values["question"]["question"]["en"]
-        values["answer_text"] = values["answer"]
-        values["answer_file"] = values["answer_file"]
-        values["submission_id"] = values["submission"]
-        values["speaker_id"] = values["person"]
-        return values
+    # Extracted with aliases rather than a "before" validator,
+    # so that validating from JSON does not need to go through Python dicts
+    question_text: str = Field(validation_alias=AliasPath("question", "question", "en"))
+    answer_text: str = Field(validation_alias="answer")
+    answer_file: str | None
+    submission_id: str | None = Field(validation_alias="submission")
+    speaker_id: str | None = Field(validation_alias="person")
 
 
 class PretalxSlot(BaseModel):
@@ -69,9 +62,21 @@ class PretalxSubmission(BaseModel):
     slot_count: int = Field(..., exclude=True)
 
     # Extracted from slot data
-    room: str | None = None
-    start: datetime | None = None
-    end: datetime | None = None
+    room: str | None = Field(None, validation_alias=AliasPath("slot", "room"))
+    start: datetime | None = Field(None, validation_alias=AliasPath("slot", "start"))
+    end: datetime | None = Field(None, validation_alias=AliasPath("slot", "end"))
+
+    @field_validator("speakers", mode="before")
+    @classmethod
+    def speaker_codes(cls, v) -> list[str]:
+        return sorted([s["code"] for s in v])
+
+    @field_validator("room", mode="before")
+    @classmethod
+    def handle_localized_room(cls, v) -> str | None:
+        if isinstance(v, dict):
+            return v.get("en")
+        return v
 
     @field_validator("submission_type", "track", mode="before")
     @classmethod
@@ -92,20 +97,6 @@ class PretalxSubmission(BaseModel):
     def handle_resources(cls, v) -> list[dict[str, str]] | None:
         return v or None
 
-    @model_validator(mode="before")
-    @classmethod
-    def process_values(cls, values) -> dict:
-        values["speakers"] = sorted([s["code"] for s in values["speakers"]])
-
-        # Set slot information
-        if values.get("slot"):
-            slot = PretalxSlot.model_validate(values["slot"])
-            values["room"] = slot.room
-            values["start"] = slot.start
-            values["end"] = slot.end
-
-        return values
-
     @property
     def is_publishable(self) -> bool:
         return self.state in (SubmissionState.accepted, SubmissionState.confirmed)
@@ -146,3 +137,17 @@ class PretalxSchedule(BaseModel):
 
     slots: list[PretalxSubmission]
     breaks: list[PretalxScheduleBreak]
+
+
+class PretalxLazySchedule(BaseModel):
+    """
+    Model for Pretalx schedule data, where only the breaks are validated upfront,
+    the slots are kept as raw JSON until they are accessed
+    """
+
+    breaks: list[PretalxScheduleBreak]
+    raw: bytes = Field(b"", repr=False, exclude=True)
+
+    @cached_property
+    def slots(self) -> list[PretalxSubmission]:
+        return PretalxSchedule.model_validate_json(self.raw).slots
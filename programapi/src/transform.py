@@ -1,39 +1,107 @@
-import sys
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
 
 from src.config import Config
+from src.utils.compression import Compression
+from src.utils.delta_feed import DeltaFeed
+from src.utils.output_writer import OutputWriter
+from src.utils.parallel_parse import ParallelParse
 from src.utils.parse import Parse
+from src.utils.parse_cache import ParseCache
+from src.utils.profiler import Profiler
+from src.utils.shards import Shards
+from src.utils.sqlite_export import SQLiteExport
 from src.utils.timing_relationships import TimingRelationships
 from src.utils.transform import Transform
 from src.utils.utils import Utils
 
-if __name__ == "__main__":
-    print(f"Parsing the data from {Config.raw_path}...")
-    pretalx_submissions = Parse.publishable_submissions(
-        Config.raw_path / "submissions_latest.json"
-    )
-    pretalx_speakers = Parse.publishable_speakers(
-        Config.raw_path / "speakers_latest.json", pretalx_submissions.keys()
-    )
-    pretalx_schedule = Parse.schedule(Config.raw_path / "schedule_latest.json")
+
+def raw_files(raw_path: Path) -> dict[str, Path]:
+    """
+    Returns the raw files of the submissions, speakers and schedule
+    """
+    return {
+        "submissions": Parse.raw_file(raw_path, "submissions"),
+        "speakers": Parse.raw_file(raw_path, "speakers"),
+        "schedule": raw_path / "schedule_latest.json",
+    }
+
+
+def input_hashes(input_files: dict[str, Path]) -> dict[str, str]:
+    """
+    Returns the SHA-256 of the raw files and of the code the output is made from
+    """
+    code = hashlib.sha256()
+    for module_file in sorted(Path(__file__).parent.rglob("*.py")):
+        code.update(module_file.read_bytes())
+    return {
+        name: OutputWriter.file_hash(input_file)
+        for name, input_file in input_files.items()
+    } | {"code": code.hexdigest()}
+
+
+def transform(
+    raw_path: Path,
+    public_path: Path,
+    cache_path: Path,
+    inputs: dict[str, str] | None = None,
+    warn_dupes: bool = False,
+    fast_parse: bool = False,
+    parse_cache: bool = True,
+    parse_workers: int = Config.parse_workers,
+) -> dict[str, dict[str, Any]]:
+    """
+    Transforms the raw files into the files of the public directory, in stages
+    recorded by the active Profiler, and returns the report of the compression.
+    The inputs (see input_hashes) are recorded in the manifest once done.
+    """
+    input_files = raw_files(raw_path)
+    if inputs is None:
+        inputs = input_hashes(input_files)
+    writer = OutputWriter(public_path)
+
+    print(f"Parsing the data from {raw_path}...")
+    cache = ParseCache(cache_path, enabled=parse_cache)
+
+    # Only the breaks of the schedule are used
+    pretalx_submissions, pretalx_speakers, pretalx_schedule = ParallelParse(
+        workers=parse_workers,
+        fast=fast_parse,
+        lazy_schedule=True,
+        cache=cache,
+    ).parse(*input_files.values())
+
+    if cache.hits:
+        print(f"Reused the parsed {', '.join(cache.hits)} from the cache.")
 
     ## Parse the YouTube data
-    #youtube_data = Parse.youtube(Config.raw_path / "youtube_latest.json")
+    # youtube_data = Parse.youtube(raw_path / "youtube_latest.json")
 
     print("Computing timing relationships...")
-    TimingRelationships.compute(pretalx_submissions.values())
+    with Profiler.stage("TimingRelationships.compute"):
+        timing_relationships = TimingRelationships.compute(pretalx_submissions.values())
 
     print("Transforming the data...")
-    ep_sessions = Transform.pretalx_submissions_to_europython_sessions(
-        pretalx_submissions,
-        #youtube_data,
-    )
-    ep_speakers = Transform.pretalx_speakers_to_europython_speakers(pretalx_speakers)
-    ep_schedule = Transform.pretalx_schedule_to_europython_schedule(
-        pretalx_schedule.breaks, ep_sessions, ep_speakers
-    )
+    with Profiler.stage("Transform.pretalx_submissions_to_europython_sessions"):
+        ep_sessions = Transform.pretalx_submissions_to_europython_sessions(
+            pretalx_submissions,
+            timing_relationships,
+            # youtube_data,
+        )
+    with Profiler.stage("Transform.pretalx_speakers_to_europython_speakers"):
+        ep_speakers = Transform.pretalx_speakers_to_europython_speakers(
+            pretalx_speakers
+        )
+    with Profiler.stage("Transform.pretalx_schedule_to_europython_schedule"):
+        ep_schedule = Transform.pretalx_schedule_to_europython_schedule(
+            pretalx_schedule.breaks, ep_sessions, ep_speakers
+        )
 
     # Warn about duplicates if the flag is set
-    if len(sys.argv) > 1 and sys.argv[1] == "--warn-dupes":
+    if warn_dupes:
         Utils.warn_duplicates(
             session_attributes_to_check=["title"],
             speaker_attributes_to_check=["name"],
@@ -41,9 +109,136 @@ if __name__ == "__main__":
             speakers_to_check=ep_speakers,
         )
 
-    print(f"Writing the data to {Config.public_path}...")
-    Utils.write_to_file(Config.public_path / "sessions.json", ep_sessions)
-    Utils.write_to_file(Config.public_path / "speakers.json", ep_speakers)
-    Utils.write_to_file(
-        Config.public_path / "schedule.json", ep_schedule, direct_dump=True
+    print(f"Writing the data to {public_path}...")
+    with Profiler.stage("Utils.write_to_file sessions.json"):
+        Utils.write_to_file(public_path / "sessions.json", ep_sessions, writer=writer)
+    with Profiler.stage("Utils.write_to_file speakers.json"):
+        Utils.write_to_file(public_path / "speakers.json", ep_speakers, writer=writer)
+    with Profiler.stage("Utils.write_to_file schedule.json"):
+        Utils.write_to_file(
+            public_path / "schedule.json",
+            ep_schedule,
+            direct_dump=True,
+            writer=writer,
+        )
+    with Profiler.stage("Shards.write"):
+        shard_writer = Shards.write(writer, ep_sessions, ep_speakers, ep_schedule)
+    with Profiler.stage("SQLiteExport.write"):
+        SQLiteExport.write(writer, ep_sessions, ep_speakers, ep_schedule)
+    delta_feed = DeltaFeed(public_path, cache_path)
+    with Profiler.stage("DeltaFeed.publish"):
+        version = delta_feed.publish(writer)
+    print(f"The version of the data is {version}.")
+
+    print("Compressing the data...")
+    with Profiler.stage("Compression.compress_files"):
+        compression_report = Compression().compress_files(
+            public_path,
+            writer.written + shard_writer.written + delta_feed.written,
+        )
+    for name in ["sessions.json", "speakers.json", "schedule.json"]:
+        if name in compression_report:
+            row = compression_report[name]
+            print(f"  {name}: {row['size']} bytes, gz {row['gz_ratio']}x")
+
+    # Only once everything is written and compressed: the files of a run that
+    # stopped before are then written and compressed again by the next one
+    shard_writer.save_manifest()
+    writer.set_inputs(inputs)
+    writer.save_manifest()
+
+    written = len(writer.written) + len(shard_writer.written)
+    unchanged = len(writer.unchanged) + len(shard_writer.unchanged)
+    print(f"Wrote {written} files, kept {unchanged} unchanged files.")
+
+    return compression_report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--warn-dupes",
+        action="store_true",
+        help="Warn about duplicate session titles and speaker names",
+    )
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Do nothing if the output was made from the same raw files (and code)",
+    )
+    parser.add_argument(
+        "--fast-parse",
+        action="store_true",
+        help="Validate the raw files directly from JSON bytes with TypeAdapters",
+    )
+    parser.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        help="Always parse the raw files, even if they did not change",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=Config.parse_workers,
+        help="Number of processes parsing the raw files (1 to parse sequentially)",
     )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="REPORT",
+        help="Write the wall time, CPU time, objects and peak memory of every stage "
+        "to this JSON file (the raw files are then parsed without workers)",
+    )
+    parser.add_argument(
+        "--profile-pstats",
+        type=Path,
+        metavar="DIR",
+        help="With --profile, also write a cProfile of every stage to this directory",
+    )
+    parser.add_argument(
+        "--compression-report",
+        type=Path,
+        metavar="REPORT",
+        help="Write the size and compression ratio of every output file compressed "
+        "in this run to this JSON file",
+    )
+    args = parser.parse_args()
+
+    input_files = raw_files(Config.raw_path)
+    inputs = input_hashes(input_files)
+    writer = OutputWriter(Config.public_path)
+    if (
+        args.skip_unchanged
+        and writer.up_to_date(inputs)
+        and Shards.writer(writer).complete()
+    ):
+        print("The output is up to date with the raw files, skipping.")
+        raise SystemExit(0)
+
+    if args.profile:
+        # The time and memory of the worker processes would not be in the profile
+        if args.parse_workers != 1:
+            print("Profiling: parsing the raw files in this process, without workers.")
+            args.parse_workers = 1
+        profiler = Profiler(pstats_dir=args.profile_pstats)
+        profiler.start()
+
+    compression_report = transform(
+        Config.raw_path,
+        Config.public_path,
+        Config.cache_path,
+        inputs,
+        warn_dupes=args.warn_dupes,
+        fast_parse=args.fast_parse,
+        parse_cache=not args.no_parse_cache,
+        parse_workers=args.parse_workers,
+    )
+
+    if args.compression_report:
+        with open(args.compression_report, "w") as fd:
+            json.dump(compression_report, fd, indent=2)
+
+    if args.profile:
+        profiler.stop()
+        profiler.write(args.profile)
+        print(f"Wrote the profile of the stages to {args.profile}.")
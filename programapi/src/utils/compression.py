@@ -0,0 +1,72 @@
+import gzip
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from src.config import Config
+from src.utils.output_writer import OutputWriter
+
+
+class Compression:
+    """
+    Writes gzip copies of the JSON files, at the highest compression level, next to
+    them (schedule.json.gz, ...), for nginx to serve them as they are (gzip_static)
+    instead of compressing them on every request.
+
+    Only the files that were written are compressed, as given by the writers,
+    in threads (zlib releases the GIL). Like nginx's ``gzip_min_length``, the
+    files smaller than ``min_bytes`` are not compressed, as they gain little.
+    """
+
+    suffix = ".gz"
+
+    def __init__(
+        self,
+        workers: int = Config.write_workers,
+        min_bytes: int = Config.compression_min_bytes,
+    ) -> None:
+        self.workers = workers
+        self.min_bytes = min_bytes
+
+    @staticmethod
+    def siblings(name: str) -> list[str]:
+        """
+        Returns the names of the compressed copies of the given file
+        """
+        return [name + Compression.suffix]
+
+    def compress(self, input_file: Path) -> dict[str, Any] | None:
+        """
+        Writes the compressed copy of the given file, and returns the size of the
+        file and of the copy, and their ratio, or None if the file is too small
+        """
+        output_file = input_file.with_name(input_file.name + Compression.suffix)
+        data = input_file.read_bytes()
+        if len(data) < self.min_bytes:
+            # The copy of a larger version of the file would be stale
+            output_file.unlink(missing_ok=True)
+            return None
+
+        # Without a timestamp in the header, the output only depends on the input
+        compressed = gzip.compress(data, 9, mtime=0)
+        OutputWriter.replace(output_file, lambda path: path.write_bytes(compressed))
+        return {
+            "size": len(data),
+            "gz": len(compressed),
+            "gz_ratio": round(len(data) / max(len(compressed), 1), 2),
+        }
+
+    def compress_files(
+        self, output_dir: Path | str, names: Iterable[str]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Compresses the given JSON files (by path relative to the given directory),
+        and returns the report of every compressed file, by name
+        """
+        names = sorted({name for name in names if name.endswith(".json")})
+        with ThreadPoolExecutor(self.workers) as executor:
+            rows = executor.map(
+                lambda name: self.compress(Path(output_dir) / name), names
+            )
+            return {name: row for name, row in zip(names, rows) if row is not None}
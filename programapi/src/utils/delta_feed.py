@@ -0,0 +1,278 @@
+import copy
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from src.config import Config
+from src.utils.compression import Compression
+from src.utils.output_writer import OutputWriter
+from src.utils.serializer import Serializer
+
+
+class DeltaFeed:
+    """
+    Publishes the changes of sessions.json, speakers.json and schedule.json from
+    one run to the next as JSON Patches (RFC 6902), so that clients can fetch
+    only what changed instead of the whole files.
+
+    The patches apply to the document ``{"sessions": <sessions.json>, "speakers":
+    <speakers.json>, "schedule": <schedule.json>}``. Every run that changes it
+    increments the version, and writes the patch from the previous version to
+    patches/<version>.json. patches/index.json lists the ``size`` most recent
+    patches: a client holding version N applies the ones from N to the current
+    version, in order, or fetches the files again if they do not go back to N.
+
+    The last published version and document, and the hashes of its files, are
+    kept in the cache directory. The patches are made from that document rather
+    than from the files on the disk, which a run that stopped before publishing
+    may have replaced already. The versions also keep increasing when the output
+    directory is lost (and the patches with it): ``reset`` in the index is the last
+    version published without a patch, from which the clients holding an older
+    version need to fetch the files again.
+    """
+
+    files = {
+        "sessions": "sessions.json",
+        "speakers": "speakers.json",
+        "schedule": "schedule.json",
+    }
+    directory = "patches"
+    index_file = "patches/index.json"
+    state_file = "delta-feed.json"
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        cache_dir: Path | str,
+        size: int = Config.delta_feed_size,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.state_path = Path(cache_dir) / DeltaFeed.state_file
+        self.size = size
+        # The patches written, by path relative to the output directory
+        self.written: list[str] = []
+
+    def load(self) -> dict[str, Any]:
+        """
+        Returns the document of the files in the output directory
+        """
+        document = {}
+        for key, name in DeltaFeed.files.items():
+            with open(self.output_dir / name) as fd:
+                document[key] = json.load(fd)
+        return document
+
+    def hashes(self, writer: OutputWriter) -> dict[str, str]:
+        """
+        Returns the SHA-256 of the files in the output directory,
+        from the manifest of the given writer when they are in it
+        """
+        return {
+            name: writer.manifest.get(name, {}).get("sha256")
+            or OutputWriter.file_hash(self.output_dir / name)
+            for name in DeltaFeed.files.values()
+        }
+
+    def load_index(self) -> dict[str, Any]:
+        try:
+            with open(self.output_dir / DeltaFeed.index_file) as fd:
+                return json.load(fd)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"version": 0, "reset": 0, "patches": []}
+
+    def load_state(self) -> dict[str, Any]:
+        """
+        Returns the last published version, the hashes of its files and its
+        document, as kept in the cache directory
+        """
+        try:
+            with open(self.state_path) as fd:
+                state = json.load(fd)
+            return {
+                "version": state["version"],
+                "hashes": state["hashes"],
+                "document": state["document"],
+            }
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return {"version": 0, "hashes": {}, "document": None}
+
+    def save_state(
+        self, version: int, hashes: dict[str, str], document: dict[str, Any]
+    ) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        state = {"version": version, "hashes": hashes, "document": document}
+        OutputWriter.replace(
+            self.state_path, lambda path: path.write_text(json.dumps(state))
+        )
+
+    @staticmethod
+    def pointer(path: str, key: str | int) -> str:
+        """
+        Returns the JSON Pointer (RFC 6901) of the given key of the given path
+        """
+        return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+    @staticmethod
+    def diff(source: Any, target: Any, path: str = "") -> list[dict[str, Any]]:
+        """
+        Returns the operations turning the source into the target:
+        the values of the dicts are compared key by key, and the lists item by item
+        once their common beginning and end are left out, so that inserting or
+        removing an item is a single operation.
+
+        The values are compared like in Python (where 1 == 1.0 == True), which is
+        enough for the values of the fields of the models, that have one type.
+        """
+        if source == target:
+            return []
+
+        if isinstance(source, dict) and isinstance(target, dict):
+            operations = []
+            for key in sorted(source.keys() - target.keys()):
+                operations.append(
+                    {"op": "remove", "path": DeltaFeed.pointer(path, key)}
+                )
+            for key in sorted(target):
+                if key in source:
+                    operations += DeltaFeed.diff(
+                        source[key], target[key], DeltaFeed.pointer(path, key)
+                    )
+                else:
+                    operations.append(
+                        {
+                            "op": "add",
+                            "path": DeltaFeed.pointer(path, key),
+                            "value": target[key],
+                        }
+                    )
+            return operations
+
+        if isinstance(source, list) and isinstance(target, list):
+            length = min(len(source), len(target))
+            start = 0
+            while start < length and source[start] == target[start]:
+                start += 1
+            end = 0
+            while end < length - start and source[-1 - end] == target[-1 - end]:
+                end += 1
+            source_items = source[start : len(source) - end]
+            target_items = target[start : len(target) - end]
+
+            operations = []
+            common = min(len(source_items), len(target_items))
+            for i in range(common):
+                operations += DeltaFeed.diff(
+                    source_items[i], target_items[i], DeltaFeed.pointer(path, start + i)
+                )
+            # From the last one, for the indices of the others to stay the same
+            for i in reversed(range(common, len(source_items))):
+                operations.append(
+                    {"op": "remove", "path": DeltaFeed.pointer(path, start + i)}
+                )
+            for i in range(common, len(target_items)):
+                operations.append(
+                    {
+                        "op": "add",
+                        "path": DeltaFeed.pointer(path, start + i),
+                        "value": target_items[i],
+                    }
+                )
+            return operations
+
+        return [{"op": "replace", "path": path, "value": target}]
+
+    @staticmethod
+    def apply(document: Any, operations: list[dict[str, Any]]) -> Any:
+        """
+        Returns the given document with the given operations applied
+        (only the add, remove and replace ones, which are the ones of diff)
+        """
+        document = copy.deepcopy(document)
+        for operation in operations:
+            if operation["path"] == "":
+                document = copy.deepcopy(operation.get("value"))
+                continue
+
+            *parents, key = [
+                token.replace("~1", "/").replace("~0", "~")
+                for token in operation["path"].split("/")[1:]
+            ]
+            parent = document
+            for token in parents:
+                parent = parent[int(token) if isinstance(parent, list) else token]
+
+            op, value = operation["op"], copy.deepcopy(operation.get("value"))
+            if isinstance(parent, list):
+                index = len(parent) if key == "-" else int(key)
+                if op == "add":
+                    parent.insert(index, value)
+                elif op == "remove":
+                    del parent[index]
+                else:
+                    parent[index] = value
+            elif op == "remove":
+                del parent[key]
+            else:
+                parent[key] = value
+
+        return document
+
+    def publish(self, writer: OutputWriter) -> int:
+        """
+        Writes the patch from the last published document to the one of the files
+        (written with the given writer), if they differ, updates the index and
+        removes the patches that are out of it. Returns the current version.
+        """
+        index = self.load_index()
+        state = self.load_state()
+        hashes = self.hashes(writer)
+        # Whether the patches of the output directory go on from the last version
+        published = bool(index["version"]) and index["version"] == state["version"]
+        if published and hashes == state["hashes"]:
+            return index["version"]
+
+        current = self.load()
+        if not published or state["document"] is None:
+            # Nothing to patch from: the clients need to fetch the files.
+            # The version still follows the last one they may hold.
+            version = max(index["version"], state["version"]) + 1
+            index = {"version": version, "reset": version, "patches": []}
+            operations = None
+        else:
+            operations = DeltaFeed.diff(state["document"], current)
+            if not operations:
+                self.save_state(index["version"], hashes, current)
+                return index["version"]
+            index["version"] += 1
+
+        version = index["version"]
+        if operations is not None:
+            name = f"{DeltaFeed.directory}/{version}.json"
+            OutputWriter.replace(
+                self.output_dir / name,
+                lambda path: path.write_text(Serializer.dumps(operations)),
+            )
+            self.written.append(name)
+            index["patches"].append(
+                {
+                    "from": version - 1,
+                    "to": version,
+                    "path": name,
+                    "operations": len(operations),
+                    "created_at": datetime.now(timezone.utc).isoformat(
+                        timespec="seconds"
+                    ),
+                }
+            )
+        index["patches"] = index["patches"][-self.size :]
+
+        writer.write_text(
+            self.output_dir / DeltaFeed.index_file, Serializer.dumps(index)
+        )
+        keep = {DeltaFeed.index_file} | {patch["path"] for patch in index["patches"]}
+        keep |= {sibling for name in keep for sibling in Compression.siblings(name)}
+        writer.prune(self.output_dir / DeltaFeed.directory, keep=keep)
+        self.save_state(version, hashes, current)
+
+        return version
@@ -0,0 +1,289 @@
+import asyncio
+import json
+import os
+from collections import deque
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+from src.config import Config
+from src.utils.http_cache import HttpCache
+from src.utils.request_scheduler import PretalxAPIError, RequestScheduler
+
+
+class Download:
+    """
+    Downloads the Pretalx resources concurrently, with at most ``concurrency``
+    requests in flight, adapting to the rate limits of Pretalx (see RequestScheduler).
+    If a cache is given, the requests are conditional and unchanged pages are
+    served from the disk.
+
+    In ``stream`` mode, the paginated resources are written page by page
+    to JSONL files instead of being collected in memory.
+    """
+
+    changes_file = "changes.json"
+
+    def __init__(
+        self,
+        base_url: str,
+        concurrency: int = Config.download_concurrency,
+        cache: HttpCache | None = None,
+        session: requests.Session | None = None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+        scheduler: RequestScheduler | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.stream = stream
+        self.cache = cache
+        self.session = session or Download.new_session(concurrency)
+        self.headers = Download.auth_headers() if headers is None else headers
+        self.scheduler = scheduler or RequestScheduler(concurrency)
+
+        # Resource name -> whether any of its pages changed since the last run
+        self.changes: dict[str, bool] = {}
+
+    @staticmethod
+    def auth_headers() -> dict[str, str]:
+        return {
+            "Accept": "application/json, text/javascript",
+            "Authorization": f"Token {Config.token()}",
+        }
+
+    @staticmethod
+    def new_session(concurrency: int) -> requests.Session:
+        """
+        Returns a session whose connection pool is large enough
+        to keep one connection per concurrent request alive
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def page_url(url: str, offset: int) -> str:
+        """
+        Returns the given paginated URL pointing to the given offset,
+        keeping all the other query parameters (limit, questions, ...) as they are
+        """
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query["offset"] = str(offset)
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    @staticmethod
+    def name(resource: str) -> str:
+        """
+        Returns the resource name without extra parameters, e.g.
+        submissions?questions=all -> submissions
+        """
+        return resource.split("?")[0].strip("/").split("/")[-1]
+
+    def fetch(self, url: str) -> tuple[bytes, bool]:
+        """
+        Returns the body of the given URL and whether it changed since it was cached
+        """
+        cached = self.cache.get(url) if self.cache else None
+        headers = self.headers | HttpCache.conditional_headers(cached)
+
+        response = self.session.get(url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            return cached["body"].encode(), False
+
+        if response.status_code != 200:
+            raise PretalxAPIError(
+                response.status_code,
+                response.text,
+                response.headers.get("Retry-After"),
+            )
+
+        body = response.content
+        changed = cached is None or cached["body"].encode() != body
+        if self.cache and changed:
+            self.cache.store(
+                url,
+                body.decode(),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+
+        return body, changed
+
+    async def get_json(self, url: str, name: str) -> dict[str, Any]:
+        body, changed = await self.scheduler.run(name, lambda: self.fetch(url))
+
+        self.changes[name] = self.changes.get(name, False) or changed
+        return json.loads(body)
+
+    async def pages(
+        self, resource: str, start: int = 0, pbar: tqdm | None = None
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yields the results of all the pages of a paginated resource, in order,
+        starting from the given offset.
+
+        The first page tells us the total ``count`` and the page size,
+        the remaining pages are then requested concurrently by their offset,
+        keeping at most ``2 * concurrency`` downloaded pages in memory.
+        """
+        name = Download.name(resource)
+        url = self.base_url + resource
+        if start:
+            url = Download.page_url(url, start)
+
+        first_page = await self.get_json(url, name)
+        page_size = len(first_page["results"])
+
+        offsets = iter(())
+        if first_page["next"] and page_size:
+            offsets = iter(range(start + page_size, first_page["count"], page_size))
+            if pbar is not None:
+                pbar.total = -(-(first_page["count"] - start) // page_size)
+
+        if pbar is not None:
+            pbar.update(1)
+        yield first_page["results"]
+
+        pending: deque[asyncio.Task] = deque()
+
+        def schedule_pages() -> None:
+            while len(pending) < 2 * self.concurrency:
+                if (offset := next(offsets, None)) is None:
+                    break
+                page_url = Download.page_url(first_page["next"], offset)
+                pending.append(asyncio.create_task(self.get_json(page_url, name)))
+
+        last_page = first_page
+        try:
+            schedule_pages()
+            while pending:
+                last_page = await pending.popleft()
+                schedule_pages()
+                if pbar is not None:
+                    pbar.update(1)
+                yield last_page["results"]
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # The event might have grown while we were downloading,
+        # follow the remaining links like a serial download would do
+        next_url = last_page["next"]
+        while next_url:
+            page = await self.get_json(next_url, name)
+            if pbar is not None:
+                pbar.update(1)
+            yield page["results"]
+            next_url = page["next"]
+
+    async def paginated(
+        self, resource: str, pbar: tqdm | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Downloads all the pages of a paginated resource into a single list
+        """
+        results: list[dict[str, Any]] = []
+        async for page_results in self.pages(resource, pbar=pbar):
+            results += page_results
+        return results
+
+    @staticmethod
+    def resume_offset(part_path: Path) -> int:
+        """
+        Returns the number of records completely written to the given JSONL file,
+        dropping a partially written last line if the previous run crashed
+        """
+        if not part_path.exists():
+            return 0
+
+        with open(part_path, "rb+") as fd:
+            content = fd.read()
+            complete = content.rfind(b"\n") + 1
+            if complete != len(content):
+                fd.truncate(complete)
+
+        return content.count(b"\n", 0, complete)
+
+    def write(self, name: str, data: Any) -> None:
+        """
+        Writes the downloaded data, unless it did not change
+        and the previous file is still there
+        """
+        filepath = Config.raw_path / f"{name}_latest.json"
+        if self.changes.get(name, True) or not filepath.exists():
+            with open(filepath, "w") as fd:
+                json.dump(data, fd)
+
+    async def resource_to_file(self, resource: str, position: int = 0) -> None:
+        pbar = tqdm(
+            desc=f"Downloading {resource}",
+            unit=" page",
+            dynamic_ncols=True,
+            position=position,
+        )
+        if self.stream:
+            await self.stream_to_file(resource, pbar)
+        else:
+            self.write(Download.name(resource), await self.paginated(resource, pbar))
+        pbar.close()
+
+    async def stream_to_file(self, resource: str, pbar: tqdm | None = None) -> None:
+        """
+        Appends the records of every page to ``<name>_latest.jsonl.part`` as they arrive,
+        and atomically promotes it to ``<name>_latest.jsonl`` when all pages are there.
+
+        If a previous run crashed, it resumes from the last completely written record.
+        """
+        name = Download.name(resource)
+        filepath = Config.raw_path / f"{name}_latest.jsonl"
+        part_path = filepath.with_name(filepath.name + ".part")
+
+        start = Download.resume_offset(part_path)
+        if start:
+            # The records before the offset were downloaded in the crashed run
+            self.changes[name] = True
+
+        with open(part_path, "a") as fd:
+            async for results in self.pages(resource, start, pbar):
+                fd.write("".join(json.dumps(record) + "\n" for record in results))
+                fd.flush()
+
+        if self.changes.get(name, True) or not filepath.exists():
+            os.replace(part_path, filepath)
+        else:
+            part_path.unlink()
+
+    async def schedule_to_file(self) -> None:
+        data = await self.get_json(self.base_url + "schedules/latest/", "schedule")
+        self.write("schedule", data)
+
+    async def all(self, resources: list[str]) -> dict[str, bool]:
+        """
+        Downloads all the given paginated resources and the latest schedule
+        at the same time, and reports which of them changed since the last run
+        """
+        Config.raw_path.mkdir(parents=True, exist_ok=True)
+
+        with self.session:
+            await asyncio.gather(
+                *(
+                    self.resource_to_file(resource, position)
+                    for position, resource in enumerate(resources)
+                ),
+                self.schedule_to_file(),
+            )
+
+        with open(Config.raw_path / Download.changes_file, "w") as fd:
+            json.dump(self.changes, fd, indent=2)
+
+        return self.changes
@@ -0,0 +1,147 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+class FakePretalx:
+    """
+    A local stand-in for the Pretalx API, to test and benchmark the download offline.
+
+    Lists are served like Pretalx does, with limit/offset pagination
+    and filtering by ``state``, anything else (e.g. ``schedules/latest``) is served as is.
+
+    Every response is delayed by ``latency`` seconds (plus up to ``jitter`` seconds),
+    every ``rate_limit_every``-th request is rejected with a 429, and
+    a share of ``error_rate`` of the requests fails with a 502/503.
+    """
+
+    def __init__(
+        self,
+        resources: dict[str, Any],
+        event: str = "fake-event",
+        page_size: int = 25,
+        rate_limit_every: int = 0,
+        retry_after: str = "1",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.resources = {name.strip("/"): data for name, data in resources.items()}
+        self.event = event
+        self.page_size = page_size
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        self.thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/events/{self.event}/"
+
+    def handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                status, body, headers = fake.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def respond(self, path: str) -> tuple[int, bytes, dict[str, str]]:
+        with self.lock:
+            self.requests += 1
+            rate_limited = bool(
+                self.rate_limit_every and self.requests % self.rate_limit_every == 0
+            )
+            failed = not rate_limited and self.rng.random() < self.error_rate
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            self.rate_limited += rate_limited
+            self.errors += failed
+
+        if delay:
+            time.sleep(delay)
+
+        if rate_limited:
+            return 429, b'{"detail": "Throttled"}', {"Retry-After": self.retry_after}
+        if failed:
+            return self.rng.choice([502, 503]), b"Bad Gateway", {}
+
+        parts = urlsplit(path)
+        prefix = f"/api/events/{self.event}/"
+        name = parts.path.removeprefix(prefix).strip("/")
+        if not parts.path.startswith(prefix) or name not in self.resources:
+            return 404, b'{"detail": "Not found."}', {}
+
+        data = self.resources[name]
+        if isinstance(data, list):
+            data = self.page(name, data, parse_qs(parts.query))
+
+        return 200, json.dumps(data).encode(), {}
+
+    def page(
+        self, name: str, records: list[Any], query: dict[str, list[str]]
+    ) -> dict[str, Any]:
+        limit = int(query.get("limit", [self.page_size])[0])
+        offset = int(query.get("offset", [0])[0])
+        if states := query.get("state"):
+            records = [r for r in records if r.get("state") in states]
+        end = offset + limit
+
+        next_url = None
+        if end < len(records):
+            params = {k: v[0] for k, v in query.items()} | {
+                "limit": limit,
+                "offset": end,
+            }
+            next_url = f"{self.url}{name}/?{urlencode(params)}"
+
+        return {
+            "count": len(records),
+            "next": next_url,
+            "previous": None,
+            "results": records[offset:end],
+        }
+
+    def start(self) -> "FakePretalx":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakePretalx":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+class HttpCache:
+    """
+    Per-URL cache of the last successful response (ETag, Last-Modified and body),
+    used to make conditional requests and to serve unchanged pages from disk
+    """
+
+    def __init__(self, cache_dir: Path | str) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        try:
+            with open(self.entry_path(url)) as fd:
+                entry = json.load(fd)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Hash collisions are not a concern, but a wrong entry would be
+        return entry if entry.get("url") == url else None
+
+    def store(
+        self, url: str, body: str, etag: str | None, last_modified: str | None
+    ) -> None:
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+        }
+        path = self.entry_path(url)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as fd:
+            json.dump(entry, fd)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def conditional_headers(entry: dict[str, Any] | None) -> dict[str, str]:
+        """
+        Returns the If-None-Match/If-Modified-Since headers for the given cache entry
+        """
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
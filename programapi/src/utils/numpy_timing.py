@@ -0,0 +1,267 @@
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from src.models.pretalx import PretalxSubmission
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+class NumpyTiming:
+    """
+    Vectorised computation of the timing relationships for very large schedules,
+    with the same results as the per-session one of TimingRelationships.
+
+    The start and end times are turned into int64 arrays (microseconds).
+    The sessions in parallel are found by sorted search in a window as wide as
+    the longest session, and the sessions after/before in every room of a day
+    by sorted search, skipping the ones that are filtered out.
+    """
+
+    # Number of (session, other session) pairs checked at once for the overlaps
+    batch_pairs = 2**22
+
+    def __init__(self, all_sessions: list[PretalxSubmission]) -> None:
+        self.all_sessions = all_sessions
+        self.scheduled = [i for i, s in enumerate(all_sessions) if s.start is not None]
+        sessions = [all_sessions[i] for i in self.scheduled]
+
+        self.positions = np.array(self.scheduled, dtype=np.int64)
+        self.starts = np.array([self.microseconds(s.start) for s in sessions])
+        self.ends = np.array([self.microseconds(s.end) for s in sessions])
+        self.days = np.array([s.start.day for s in sessions], dtype=np.int64)
+        rooms: dict[str | None, int] = {}
+        self.rooms = np.array(
+            [rooms.setdefault(s.room, len(rooms)) for s in sessions], dtype=np.int64
+        )
+        self.keynotes = np.array([s.submission_type == "Keynote" for s in sessions])
+        self.announcements = np.array(
+            [s.submission_type == "Announcements" for s in sessions]
+        )
+        self.codes = np.array([s.code for s in sessions], dtype=object)
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    @staticmethod
+    def supports(all_sessions: list[PretalxSubmission]) -> bool:
+        """
+        Whether the sessions can be handled: NumPy is installed, the codes are unique,
+        every scheduled session has an end, and the times are all naive or all aware
+        """
+        scheduled = [s for s in all_sessions if s.start is not None]
+        return (
+            np is not None
+            and len({s.code for s in all_sessions}) == len(all_sessions)
+            and all(s.end is not None for s in scheduled)
+            and len({s.start.tzinfo is None for s in scheduled}) <= 1
+            and all(
+                (s.start.tzinfo is None) == (s.end.tzinfo is None) for s in scheduled
+            )
+        )
+
+    @staticmethod
+    def microseconds(time: datetime) -> int:
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc if time.tzinfo else None)
+        return (time - epoch) // timedelta(microseconds=1)
+
+    def compute(
+        self,
+    ) -> dict[int, tuple[list[str], list[str], list[str], str | None, str | None]]:
+        """
+        Returns the sessions in parallel, after, before, and the next and previous
+        session of every scheduled session, by position in all_sessions
+        """
+        sessions_in_parallel = self.sessions_in_parallel()
+        relationships = {}
+
+        for day in np.unique(self.days):
+            of_day = np.flatnonzero(self.days == day)
+            after, next_session = self.sessions_after(of_day)
+            before, prev_session = self.sessions_before(of_day)
+            for row, k in enumerate(of_day.tolist()):
+                relationships[self.scheduled[k]] = (
+                    sessions_in_parallel[k],
+                    after[row],
+                    before[row],
+                    next_session[row],
+                    prev_session[row],
+                )
+
+        return {
+            position: relationships[position]
+            for position in self.scheduled
+            if self.all_sessions[position].end
+        }
+
+    def sessions_in_parallel(self) -> list[list[str]]:
+        order = np.argsort(self.starts, kind="stable")
+        sorted_starts = self.starts[order]
+        longest = int((self.ends - self.starts).max()) if len(order) else 0
+
+        # Only the sessions starting in [start - longest, end) can overlap
+        lows = np.searchsorted(sorted_starts, self.starts - longest, side="right")
+        highs = np.searchsorted(sorted_starts, self.ends, side="left")
+        counts = np.maximum(highs - lows, 0)
+
+        pairs_i, pairs_j = [], []
+        first = 0
+        while first < len(counts):
+            last = first + max(
+                1, np.searchsorted(np.cumsum(counts[first:]), self.batch_pairs)
+            )
+            batch = np.arange(first, min(last, len(counts)))
+            total = int(counts[batch].sum())
+            i = np.repeat(batch, counts[batch])
+            offsets = np.arange(total) - np.repeat(
+                np.cumsum(counts[batch]) - counts[batch], counts[batch]
+            )
+            j = order[np.repeat(lows[batch], counts[batch]) + offsets]
+            overlapping = (
+                (self.starts[j] < self.ends[i])
+                & (self.ends[j] > self.starts[i])
+                & (i != j)
+            )
+            pairs_i.append(i[overlapping])
+            pairs_j.append(j[overlapping])
+            first = last
+
+        i = np.concatenate(pairs_i) if pairs_i else np.array([], dtype=np.int64)
+        j = np.concatenate(pairs_j) if pairs_j else np.array([], dtype=np.int64)
+
+        # In the original order of the other sessions
+        pair_order = np.lexsort((self.positions[j], i))
+        i, j = i[pair_order], j[pair_order]
+        bounds = np.searchsorted(i, np.arange(len(self.positions) + 1))
+        codes = self.codes[j].tolist()
+
+        return [codes[bounds[k] : bounds[k + 1]] for k in range(len(self.positions))]
+
+    def first_accepted(
+        self,
+        of_day: "np.ndarray",
+        room_sessions: "np.ndarray",
+        indices: "np.ndarray",
+        rejected: Callable[["np.ndarray", "np.ndarray"], "np.ndarray"],
+    ) -> "np.ndarray":
+        """
+        Returns, for every session of the day, the first of ``room_sessions``
+        from its index on that is not rejected, or -1
+        """
+        while True:
+            found = indices < len(room_sessions)
+            last = len(room_sessions) - 1
+            candidates = np.where(found, room_sessions[np.minimum(indices, last)], -1)
+            skip = found & rejected(of_day, candidates)
+            if not skip.any():
+                return candidates
+            indices = indices + skip
+
+    def sessions_after(
+        self, of_day: "np.ndarray"
+    ) -> tuple[list[list[str]], list[str | None]]:
+        columns = []
+        for room in np.unique(self.rooms[of_day]):
+            in_room = of_day[self.rooms[of_day] == room]
+            in_room = in_room[
+                np.lexsort((self.positions[in_room], self.starts[in_room]))
+            ]
+            columns.append(
+                self.first_accepted(
+                    of_day,
+                    in_room,
+                    np.searchsorted(self.starts[in_room], self.ends[of_day], "left"),
+                    lambda i, j: (i == j)
+                    | (self.announcements[i] & self.announcements[j]),
+                )
+            )
+        candidates = np.stack(columns, axis=1)
+        found = candidates >= 0
+
+        # If there is a keynote next, only show that
+        keynotes = found & self.keynotes[candidates]
+        found &= keynotes | ~keynotes.any(axis=1, keepdims=True)
+
+        # Early first
+        order = np.lexsort(
+            (
+                np.where(found, self.positions[candidates], np.iinfo(np.int64).max),
+                np.where(found, self.starts[candidates], np.iinfo(np.int64).max),
+            )
+        )
+        return self.rows(of_day, candidates, found, order)
+
+    def sessions_before(
+        self, of_day: "np.ndarray"
+    ) -> tuple[list[list[str]], list[str | None]]:
+        columns = []
+        for room in np.unique(self.rooms[of_day]):
+            in_room = of_day[self.rooms[of_day] == room]
+            # Late first, and in the original order for the same start
+            in_room = in_room[
+                np.lexsort((self.positions[in_room], -self.starts[in_room]))
+            ]
+            columns.append(
+                self.first_accepted(
+                    of_day,
+                    in_room,
+                    np.searchsorted(
+                        -self.starts[in_room], -self.starts[of_day], "left"
+                    ),
+                    lambda i, j: (i == j)
+                    | self.announcements[j]
+                    | (
+                        (self.starts[j] < self.ends[i])
+                        & (self.ends[j] > self.starts[i])
+                    ),
+                )
+            )
+        candidates = np.stack(columns, axis=1)
+        found = candidates >= 0
+
+        order = np.lexsort(
+            (
+                np.where(found, self.positions[candidates], np.iinfo(np.int64).max),
+                np.where(found, -self.starts[candidates], np.iinfo(np.int64).max),
+            )
+        )
+        return self.rows(of_day, candidates, found, order)
+
+    def rows(
+        self,
+        of_day: "np.ndarray",
+        candidates: "np.ndarray",
+        found: "np.ndarray",
+        order: "np.ndarray",
+    ) -> tuple[list[list[str]], list[str | None]]:
+        """
+        Returns the codes of the found candidates of every session in the given
+        order, and the first of them in the same room or a keynote,
+        in the original order
+        """
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        found = np.take_along_axis(found, order, axis=1)
+        counts = found.sum(axis=1)
+
+        same_room = found & (
+            (self.rooms[candidates] == self.rooms[of_day][:, None])
+            | self.keynotes[candidates]
+        )
+        first = np.argmin(
+            np.where(same_room, self.positions[candidates], np.iinfo(np.int64).max),
+            axis=1,
+        )
+        has_first = same_room.any(axis=1)
+
+        codes = self.codes[candidates].tolist()
+        firsts = self.codes[np.take_along_axis(candidates, first[:, None], 1)[:, 0]]
+        return (
+            [row[:count] for row, count in zip(codes, counts.tolist())],
+            [
+                code if has else None
+                for code, has in zip(firsts.tolist(), has_first.tolist())
+            ],
+        )
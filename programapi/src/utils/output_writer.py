@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+class OutputWriter:
+    """
+    Writes the output files atomically, through a temporary file renamed over the
+    previous one, and only if their content changed, so that unchanged files keep
+    their mtime (and ETag).
+
+    The SHA-256 and size of every file are kept in ``manifest_file`` (if any), in the
+    output directory, which is itself only rewritten when a file changed: consumers
+    can poll it to know which files they need to fetch again. Without a manifest,
+    the files are compared with the ones on the disk.
+
+    The manifest also keeps the hashes of the inputs the files were written from,
+    once they all are (see ``set_inputs``), to tell whether they are up to date.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        skip_unchanged: bool = True,
+        manifest_file: str | None = "manifest.json",
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.skip_unchanged = skip_unchanged
+        self.manifest_file = manifest_file
+        self.manifest: dict[str, dict[str, Any]] = {}
+        self.inputs: dict[str, str] = {}
+        if skip_unchanged and manifest_file:
+            manifest = OutputWriter.load_manifest(self.output_dir / manifest_file)
+            self.manifest, self.inputs = manifest["files"], manifest["inputs"]
+
+        self.manifest_changed = False
+        self.written: list[str] = []
+        self.unchanged: list[str] = []
+
+    @staticmethod
+    def load_manifest(manifest_file: Path | str) -> dict[str, dict[str, Any]]:
+        """
+        Returns the files and the inputs of the given manifest
+        """
+        try:
+            with open(manifest_file) as fd:
+                manifest = json.load(fd)
+            return {"files": manifest["files"], "inputs": manifest.get("inputs", {})}
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return {"files": {}, "inputs": {}}
+
+    @staticmethod
+    def file_hash(input_file: Path | str) -> str:
+        sha256 = hashlib.sha256()
+        with open(input_file, "rb") as fd:
+            while chunk := fd.read(2**20):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    @staticmethod
+    def temporary_file(output_file: Path) -> Path:
+        """
+        Returns a new temporary file next to the given one,
+        so that it can be renamed over it atomically
+        """
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, temporary_file = tempfile.mkstemp(
+            dir=output_file.parent, prefix=f".{output_file.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        os.chmod(temporary_file, 0o644)
+        return Path(temporary_file)
+
+    @staticmethod
+    def replace(output_file: Path | str, dump: Callable[[Path], Any]) -> None:
+        """
+        Writes a file through ``dump(temporary_file)``,
+        and renames the temporary file over the given one
+        """
+        temporary_file = OutputWriter.temporary_file(Path(output_file))
+        try:
+            dump(temporary_file)
+            os.replace(temporary_file, output_file)
+        finally:
+            temporary_file.unlink(missing_ok=True)
+
+    def name(self, output_file: Path | str) -> str:
+        # Cheaper than pathlib for the files given by their full path
+        prefix = f"{self.output_dir}{os.sep}"
+        if str(output_file).startswith(prefix):
+            return str(output_file)[len(prefix) :].replace(os.sep, "/")
+        return (
+            Path(output_file)
+            .absolute()
+            .relative_to(self.output_dir.absolute())
+            .as_posix()
+        )
+
+    def write(self, output_file: Path | str, dump: Callable[[Path], Any]) -> bool:
+        """
+        Writes the given file (in the output directory) through ``dump(path)``,
+        unless its content is the same as before. Returns whether it was written.
+        """
+        output_file = Path(output_file)
+        name = self.name(output_file)
+        if not self.skip_unchanged:
+            OutputWriter.replace(output_file, dump)
+            self.written.append(name)
+            return True
+
+        temporary_file = OutputWriter.temporary_file(output_file)
+        try:
+            dump(temporary_file)
+            changed = self.check(
+                name,
+                output_file,
+                OutputWriter.file_hash(temporary_file),
+                temporary_file.stat().st_size,
+            )
+            if changed:
+                os.replace(temporary_file, output_file)
+        finally:
+            temporary_file.unlink(missing_ok=True)
+
+        return changed
+
+    def write_text(self, output_file: Path | str, text: str) -> bool:
+        """
+        Like write, for content that is already in memory: it is compared
+        before anything is written, which is faster for many small files
+        """
+        output_file = Path(output_file)
+        content = text.encode()
+        if self.skip_unchanged and not self.check(
+            self.name(output_file),
+            output_file,
+            hashlib.sha256(content).hexdigest(),
+            len(content),
+        ):
+            return False
+
+        OutputWriter.replace(output_file, lambda path: path.write_bytes(content))
+        if not self.skip_unchanged:
+            self.written.append(self.name(output_file))
+        return True
+
+    def check(self, name: str, output_file: Path, sha256: str, size: int) -> bool:
+        """
+        Returns whether the given file changed, given the SHA-256 and size of its
+        new content, and updates the manifest
+        """
+        # Without (or before) a manifest, the files are checked on the disk
+        previous = self.manifest.get(name, {}).get("sha256")
+        if previous is None and output_file.exists():
+            previous = OutputWriter.file_hash(output_file)
+        changed = sha256 != previous or not output_file.exists()
+
+        if changed or name not in self.manifest:
+            updated_at = (
+                datetime.now(timezone.utc)
+                if changed
+                else datetime.fromtimestamp(output_file.stat().st_mtime, timezone.utc)
+            )
+            self.manifest[name] = {
+                "sha256": sha256,
+                "size": size,
+                "updated_at": updated_at.isoformat(timespec="seconds"),
+            }
+            self.manifest_changed = True
+
+        (self.written if changed else self.unchanged).append(name)
+        return changed
+
+    def prune(self, directory: Path | str, keep: set[str]) -> list[str]:
+        """
+        Removes the files in the given directory (of the output directory)
+        that are not to be kept, by name, and the directories left empty
+        """
+        removed = []
+        for root, _, files in os.walk(directory, topdown=False):
+            for file in files:
+                if (name := self.name(os.path.join(root, file))) not in keep:
+                    os.unlink(os.path.join(root, file))
+                    removed.append(name)
+                    if self.manifest.pop(name, None):
+                        self.manifest_changed = True
+            if not os.listdir(root):
+                os.rmdir(root)
+
+        return removed
+
+    def up_to_date(self, inputs: dict[str, str]) -> bool:
+        """
+        Returns whether the files of the manifest were all written from the given
+        inputs (names and hashes), and are all still there
+        """
+        return self.inputs == inputs and self.complete()
+
+    def complete(self) -> bool:
+        """
+        Returns whether there is a manifest, and all its files are there
+        """
+        return bool(self.manifest) and all(
+            (self.output_dir / name).exists() for name in self.manifest
+        )
+
+    def set_inputs(self, inputs: dict[str, str]) -> None:
+        """
+        Records the inputs the files were written from, once they all are
+        """
+        if inputs != self.inputs:
+            self.inputs = inputs
+            self.manifest_changed = True
+
+    def save_manifest(self) -> bool:
+        """
+        Writes the manifest, if any file changed since it was last written
+        """
+        if not self.skip_unchanged or not self.manifest_file:
+            return False
+        manifest_file = self.output_dir / self.manifest_file
+        if not self.manifest_changed and manifest_file.exists():
+            return False
+
+        OutputWriter.replace(
+            manifest_file,
+            lambda temporary_file: temporary_file.write_text(
+                json.dumps(
+                    {"files": self.manifest, "inputs": self.inputs},
+                    indent=2,
+                    sort_keys=True,
+                )
+                + "\n"
+            ),
+        )
+        return True
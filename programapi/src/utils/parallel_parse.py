@@ -0,0 +1,183 @@
+import os
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from src.config import Config
+from src.models.pretalx import (
+    PretalxLazySchedule,
+    PretalxSchedule,
+    PretalxSpeaker,
+    PretalxSubmission,
+)
+from src.utils.parse import Parse
+from src.utils.parse_cache import ParseCache
+from src.utils.profiler import Profiler
+
+
+class ParallelParse:
+    """
+    Parses the submissions, speakers and schedule files in a process pool.
+
+    The schedule is parsed alongside the submissions, and the speakers as soon as
+    the publishable submission codes are known. JSONL files larger than
+    ``chunk_bytes`` are split into chunks that are parsed in parallel, and merged
+    back in order, so that the result is identical to parsing the files one after
+    another.
+
+    The parsed objects are pickled back from the workers, which only pays off
+    for large files on several cores: the files are parsed in this process if
+    they add up to less than ``min_bytes``, or if there is a single core.
+    """
+
+    # The number of cores the workers are limited to
+    cores = os.cpu_count() or 1
+
+    def __init__(
+        self,
+        workers: int = Config.parse_workers,
+        chunk_bytes: int = 8 * 2**20,
+        min_bytes: int = Config.parallel_parse_min_bytes,
+        fast: bool = False,
+        lazy_schedule: bool = False,
+        cache: ParseCache | None = None,
+    ) -> None:
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        self.min_bytes = min_bytes
+        self.fast = fast
+        self.lazy_schedule = lazy_schedule
+        self.cache = cache or ParseCache(Config.cache_path, enabled=False)
+
+    @staticmethod
+    def split(
+        input_file: Path | str, chunk_bytes: int | None, output_dir: Path | str
+    ) -> list[Path]:
+        """
+        Splits a JSONL file into JSONL files of about ``chunk_bytes`` each, line by
+        line. A JSON file, or a file that is not larger than that, is returned as is:
+        splitting a JSON list would mean decoding it and encoding it again.
+        """
+        input_file = Path(input_file)
+        if (
+            chunk_bytes is None
+            or input_file.suffix != ".jsonl"
+            or input_file.stat().st_size <= chunk_bytes
+        ):
+            return [input_file]
+
+        chunks: list[Path] = []
+        chunk: list[bytes] = []
+        size = 0
+        with open(input_file, "rb") as fd:
+            for line in fd:
+                if not line.strip():
+                    continue
+                chunk.append(line if line.endswith(b"\n") else line + b"\n")
+                size += len(line)
+                if size >= chunk_bytes:
+                    chunks.append(
+                        Path(output_dir) / f"{input_file.stem}.{len(chunks)}.jsonl"
+                    )
+                    chunks[-1].write_bytes(b"".join(chunk))
+                    chunk, size = [], 0
+        if chunk or not chunks:
+            chunks.append(Path(output_dir) / f"{input_file.stem}.{len(chunks)}.jsonl")
+            chunks[-1].write_bytes(b"".join(chunk))
+
+        return chunks
+
+    @staticmethod
+    def merge(futures: list[Future]) -> dict:
+        merged = {}
+        for future in futures:
+            merged.update(future.result())
+        return merged
+
+    def pool_workers(self, *input_files: Path | str) -> int:
+        """
+        Returns the number of processes to parse the given files with,
+        1 meaning that they are parsed in this process
+        """
+        if sum(Path(f).stat().st_size for f in input_files) < self.min_bytes:
+            return 1
+        return max(min(self.workers, ParallelParse.cores), 1)
+
+    @staticmethod
+    def executor(workers: int) -> Executor:
+        if workers > 1:
+            return ProcessPoolExecutor(workers)
+        return ThreadPoolExecutor(1)
+
+    def parse(
+        self,
+        submissions_file: Path | str,
+        speakers_file: Path | str,
+        schedule_file: Path | str,
+    ) -> tuple[
+        dict[str, PretalxSubmission],
+        dict[str, PretalxSpeaker],
+        PretalxSchedule | PretalxLazySchedule,
+    ]:
+        """
+        Returns the publishable submissions and speakers, and the schedule,
+        like Parse.publishable_submissions, Parse.publishable_speakers and Parse.schedule
+        """
+        workers = self.pool_workers(submissions_file, speakers_file, schedule_file)
+        chunk_bytes = self.chunk_bytes if workers > 1 else None
+
+        with (
+            ParallelParse.executor(workers) as executor,
+            tempfile.TemporaryDirectory() as tmp_dir,
+        ):
+            # The lazy and the eager schedules are different objects
+            lazy = str(self.lazy_schedule)
+            schedule = self.cache.get("schedule", schedule_file, lazy)
+            if schedule is None:
+                schedule_future = executor.submit(
+                    Parse.schedule, schedule_file, lazy=self.lazy_schedule
+                )
+
+            with Profiler.stage("Parse.publishable_submissions"):
+                submissions = self.cache.get("submissions", submissions_file)
+                if submissions is None:
+                    submissions = ParallelParse.merge(
+                        [
+                            executor.submit(
+                                Parse.publishable_submissions, chunk, fast=self.fast
+                            )
+                            for chunk in ParallelParse.split(
+                                submissions_file, chunk_bytes, tmp_dir
+                            )
+                        ]
+                    )
+                    self.cache.put("submissions", submissions_file, submissions)
+
+            # The publishable speakers depend on the publishable submissions
+            keys = ",".join(sorted(submissions.keys()))
+            with Profiler.stage("Parse.publishable_speakers"):
+                speakers = self.cache.get("speakers", speakers_file, keys)
+                if speakers is None:
+                    speakers = ParallelParse.merge(
+                        [
+                            executor.submit(
+                                Parse.publishable_speakers,
+                                chunk,
+                                set(submissions.keys()),
+                                fast=self.fast,
+                            )
+                            for chunk in ParallelParse.split(
+                                speakers_file, chunk_bytes, tmp_dir
+                            )
+                        ]
+                    )
+                    self.cache.put("speakers", speakers_file, speakers, keys)
+
+            # Only the time it is still waited for, it is parsed alongside the others
+            with Profiler.stage("Parse.schedule"):
+                if schedule is None:
+                    schedule = schedule_future.result()
+                    self.cache.put("schedule", schedule_file, schedule, lazy)
+
+        return submissions, speakers, schedule
@@ -1,24 +1,115 @@
 import json
-from collections.abc import KeysView
+from collections.abc import Callable, Iterator, KeysView
 from pathlib import Path
+from typing import Any
 
-from src.models.pretalx import PretalxSchedule, PretalxSpeaker, PretalxSubmission
+from pydantic import TypeAdapter
+
+from src.models.pretalx import (
+    PretalxLazySchedule,
+    PretalxSchedule,
+    PretalxSpeaker,
+    PretalxSubmission,
+)
+from src.utils.projection import Projection
 from src.utils.utils import Utils
 
 
 class Parse:
+    submissions_adapter = TypeAdapter(list[PretalxSubmission])
+    speakers_adapter = TypeAdapter(list[PretalxSpeaker])
+
+    @staticmethod
+    def raw_file(raw_path: Path | str, name: str) -> Path:
+        """
+        Returns the most recently downloaded ``<name>_latest.jsonl`` or
+        ``<name>_latest.json`` file, depending on how the download was run
+        """
+        candidates = [
+            path
+            for path in (
+                Path(raw_path) / f"{name}_latest.jsonl",
+                Path(raw_path) / f"{name}_latest.json",
+            )
+            if path.exists()
+        ]
+        if not candidates:
+            return Path(raw_path) / f"{name}_latest.json"
+
+        return max(candidates, key=lambda path: path.stat().st_mtime)
+
     @staticmethod
-    def publishable_submissions(input_file: Path | str) -> dict[str, PretalxSubmission]:
+    def records(
+        input_file: Path | str, skip_line: Callable[[bytes], bool] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yields the records of a JSON list file, or of a JSONL file line by line.
+
+        The lines of a JSONL file for which ``skip_line`` is true are not even parsed.
+        """
+        with open(input_file, "rb") as fd:
+            if Path(input_file).suffix == ".jsonl":
+                for line in fd:
+                    if line.strip() and not (skip_line and skip_line(line)):
+                        yield json.loads(line)
+            else:
+                # Release every record once it is consumed, rather than at the end
+                records = json.load(fd)
+                records.reverse()
+                while records:
+                    yield records.pop()
+
+    @staticmethod
+    def json_bytes(
+        input_file: Path | str, skip_line: Callable[[bytes], bool] | None = None
+    ) -> bytes:
+        """
+        Returns the content of a JSON list file, or of a JSONL file as a JSON list
+        without the lines for which ``skip_line`` is true
+        """
+        with open(input_file, "rb") as fd:
+            if Path(input_file).suffix == ".jsonl":
+                lines = (
+                    line
+                    for line in fd
+                    if line.strip() and not (skip_line and skip_line(line))
+                )
+                return b"[" + b",".join(lines) + b"]"
+            return fd.read()
+
+    @staticmethod
+    def publishable_submissions(
+        input_file: Path | str, fast: bool = False, prefilter: bool = True
+    ) -> dict[str, PretalxSubmission]:
         """
         Returns only publishable submissions
+
+        With ``fast``, the file is validated directly from the JSON bytes
+        in a single call, instead of item by item from Python dicts
+
+        With ``prefilter``, the submissions that are not publishable are dropped,
+        and the unused fields removed, before validation (see Projection).
+        In ``fast`` mode, only the JSONL lines of unpublishable submissions are dropped,
+        as building Python dicts to filter them would cost more than it saves.
         """
-        with open(input_file) as fd:
-            js = json.load(fd)
-            all_submissions = [PretalxSubmission.model_validate(s) for s in js]
-            publishable_submissions = [s for s in all_submissions if s.is_publishable]
-            publishable_submissions_by_code = {
-                s.code: s for s in publishable_submissions
-            }
+        skip_line = Projection.skip_submission_line if prefilter else None
+
+        if fast:
+            all_submissions = Parse.submissions_adapter.validate_json(
+                Parse.json_bytes(input_file, skip_line)
+            )
+        elif prefilter:
+            all_submissions = (
+                PretalxSubmission.model_validate(Projection.submission(s))
+                for s in Parse.records(input_file, skip_line)
+                if Projection.is_publishable(s)
+            )
+        else:
+            all_submissions = (
+                PretalxSubmission.model_validate(s) for s in Parse.records(input_file)
+            )
+        publishable_submissions = [s for s in all_submissions if s.is_publishable]
+        publishable_submissions_by_code = {s.code: s for s in publishable_submissions}
 
         return publishable_submissions_by_code
 
@@ -26,36 +117,67 @@ class Parse:
     def publishable_speakers(
         input_file: Path | str,
         publishable_sessions_keys: KeysView[str],
+        fast: bool = False,
+        prefilter: bool = True,
     ) -> dict[str, PretalxSpeaker]:
         """
         Returns only speakers with publishable sessions
+
+        With ``fast``, the file is validated directly from the JSON bytes
+        in a single call, instead of item by item from Python dicts
+
+        With ``prefilter``, the speakers without publishable sessions are dropped,
+        and the unused fields removed, before validation (see Projection).
+        It does not apply in ``fast`` mode.
         """
-        with open(input_file) as fd:
-            js = json.load(fd)
-            all_speakers = [PretalxSpeaker.model_validate(s) for s in js]
+        if fast:
+            all_speakers = Parse.speakers_adapter.validate_json(
+                Parse.json_bytes(input_file)
+            )
+        elif prefilter:
+            all_speakers = (
+                PretalxSpeaker.model_validate(Projection.speaker(s))
+                for s in Parse.records(input_file)
+                if publishable_sessions_keys & set(s["submissions"])
+            )
+        else:
+            all_speakers = (
+                PretalxSpeaker.model_validate(s) for s in Parse.records(input_file)
+            )
 
-            speakers_with_publishable_sessions: list[PretalxSubmission] = []
-            for speaker in all_speakers:
-                if publishable_sessions := Utils.publishable_sessions_of_speaker(
-                    speaker, publishable_sessions_keys
-                ):
-                    speaker.submissions = publishable_sessions
-                    speakers_with_publishable_sessions.append(speaker)
+        speakers_with_publishable_sessions: list[PretalxSubmission] = []
+        for speaker in all_speakers:
+            if publishable_sessions := Utils.publishable_sessions_of_speaker(
+                speaker, publishable_sessions_keys
+            ):
+                speaker.submissions = publishable_sessions
+                speakers_with_publishable_sessions.append(speaker)
 
-            publishable_speakers_by_code = {
-                s.code: s for s in speakers_with_publishable_sessions
-            }
+        publishable_speakers_by_code = {
+            s.code: s for s in speakers_with_publishable_sessions
+        }
 
         return publishable_speakers_by_code
 
     @staticmethod
-    def schedule(input_file: Path | str) -> PretalxSchedule:
+    def schedule(
+        input_file: Path | str, lazy: bool = False
+    ) -> PretalxSchedule | PretalxLazySchedule:
         """
         Returns the schedule:
 
         PretalxSchedule.slots: list[PretalxSubmission]
         PretalxSchedule.breaks: list[PretalxScheduleBreak]
+
+        With ``lazy``, only the breaks are validated, and the slots
+        only when they are first accessed.
         """
+        if lazy:
+            raw = Path(input_file).read_bytes()
+            schedule = PretalxLazySchedule.model_validate_json(raw)
+            schedule.raw = raw
+            return schedule
+
         with open(input_file) as fd:
             js = json.load(fd)
             schedule = PretalxSchedule.model_validate(js)
@@ -0,0 +1,120 @@
+import hashlib
+import os
+import pickle
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from typing import Any, TypeVar
+
+import pydantic
+
+import src.misc
+import src.models.pretalx
+import src.utils.parse
+import src.utils.projection
+import src.utils.utils
+
+T = TypeVar("T")
+
+
+class ParseCache:
+    """
+    Cache of the parsed Pretalx objects, pickled and keyed by the SHA-256 of the raw
+    file and by the schema version, so any change to the input or to the code
+    that builds the objects invalidates it.
+
+    Only the latest entry of every kind (submissions, speakers, ...) is kept.
+    """
+
+    # Everything that can change the result of parsing a raw file
+    schema_modules = [
+        src.misc,
+        src.models.pretalx,
+        src.utils.parse,
+        src.utils.projection,
+        # Utils.publishable_sessions_of_speaker, see Parse.publishable_speakers
+        src.utils.utils,
+    ]
+
+    def __init__(self, cache_dir: Path | str, enabled: bool = True) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.hits: list[str] = []
+
+    @staticmethod
+    def file_hash(input_file: Path | str) -> str:
+        sha256 = hashlib.sha256()
+        with open(input_file, "rb") as fd:
+            while chunk := fd.read(2**20):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    @staticmethod
+    @cache
+    def schema_version() -> str:
+        sha256 = hashlib.sha256(pydantic.VERSION.encode())
+        for module in ParseCache.schema_modules:
+            sha256.update(Path(module.__file__).read_bytes())
+        return sha256.hexdigest()
+
+    def key(self, input_file: Path | str, *extra: str) -> str:
+        sha256 = hashlib.sha256(ParseCache.schema_version().encode())
+        sha256.update(ParseCache.file_hash(input_file).encode())
+        for value in extra:
+            sha256.update(b"\0" + value.encode())
+        return sha256.hexdigest()
+
+    def cache_file(self, kind: str, input_file: Path | str, *extra: str) -> Path:
+        return self.cache_dir / f"{kind}-{self.key(input_file, *extra)}.pickle"
+
+    def get(self, kind: str, input_file: Path | str, *extra: str) -> Any | None:
+        """
+        Returns the cached result for the given file, or None
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with open(self.cache_file(kind, input_file, *extra), "rb") as fd:
+                result = pickle.load(fd)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        self.hits.append(kind)
+        return result
+
+    def put(self, kind: str, input_file: Path | str, result: Any, *extra: str) -> None:
+        """
+        Caches the result for the given file, replacing the previous one of that kind
+        """
+        if not self.enabled:
+            return
+
+        cache_file = self.cache_file(kind, input_file, *extra)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for old_cache_file in self.cache_dir.glob(f"{kind}-*.pickle"):
+            old_cache_file.unlink()
+
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as fd:
+            pickle.dump(result, fd, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+
+    def get_or_parse(
+        self,
+        kind: str,
+        input_file: Path | str,
+        parse: Callable[[], T],
+        *extra: str,
+    ) -> T:
+        """
+        Returns the cached result of ``parse`` for the given file, or parses and caches it.
+
+        ``extra`` are the other inputs of ``parse`` that the result depends on.
+        """
+        if (result := self.get(kind, input_file, *extra)) is not None:
+            return result
+
+        result = parse()
+        self.put(kind, input_file, result, *extra)
+        return result
@@ -0,0 +1,136 @@
+import cProfile
+import gc
+import json
+import re
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+
+class Profiler:
+    """
+    Records the wall time, CPU time, number of objects and peak of the traced memory
+    of the stages of the transformation, and optionally a cProfile of each of them.
+
+    Stages are recorded with ``Profiler.stage(name)``, which does nothing unless a
+    profiler is started, so the code can be instrumented once for all. Stages can be
+    nested: the figures of a stage include the ones of the stages within it.
+
+    Tracing the memory and counting the objects slow down the code that allocates
+    a lot of small objects, without ``memory`` only the times are recorded.
+    """
+
+    # The profiler recording the stages, if any
+    active: "Profiler | None" = None
+
+    def __init__(
+        self, pstats_dir: Path | str | None = None, memory: bool = True
+    ) -> None:
+        self.pstats_dir = Path(pstats_dir) if pstats_dir else None
+        self.memory = memory
+        self.stages: list[dict[str, Any]] = []
+
+        # The stages being recorded, innermost last, with their cProfile
+        # and the peak of the traced memory of their finished inner stages
+        self.running: list[tuple[cProfile.Profile | None, list[int]]] = []
+        self.started = 0.0
+        self.wall_time = 0.0
+
+    def start(self) -> None:
+        if self.pstats_dir:
+            self.pstats_dir.mkdir(parents=True, exist_ok=True)
+        if self.memory:
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        Profiler.active = self
+
+    def stop(self) -> None:
+        Profiler.active = None
+        if self.memory:
+            tracemalloc.stop()
+        self.wall_time = time.perf_counter() - self.started
+
+    @classmethod
+    @contextmanager
+    def stage(cls, name: str) -> Iterator[None]:
+        if cls.active is None:
+            yield
+        else:
+            with cls.active.record(name):
+                yield
+
+    @contextmanager
+    def record(self, name: str) -> Iterator[None]:
+        parent_profile = self.running[-1][0] if self.running else None
+        if parent_profile:
+            parent_profile.disable()
+        if self.running:
+            self.running[-1][1].append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+        profile = cProfile.Profile() if self.pstats_dir else None
+        inner_peaks: list[int] = []
+        self.running.append((profile, inner_peaks))
+        entry: dict[str, Any] = {"name": name, "depth": len(self.running) - 1}
+        self.stages.append(entry)
+        number = len(self.stages)
+
+        objects = len(gc.get_objects()) if self.memory else 0
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            wall_time = time.perf_counter() - wall_started
+            cpu_time = time.process_time() - cpu_started
+            peak = max([tracemalloc.get_traced_memory()[1], *inner_peaks])
+
+            entry.update(wall_time=wall_time, cpu_time=cpu_time)
+            if self.memory:
+                new_objects = len(gc.get_objects()) - objects
+                entry.update(
+                    objects=objects + new_objects,
+                    new_objects=new_objects,
+                    memory_peak=peak,
+                )
+            if profile:
+                entry["pstats"] = str(self.dump(profile, number, name))
+
+            self.running.pop()
+            if self.running:
+                self.running[-1][1].append(peak)
+            tracemalloc.reset_peak()
+            if parent_profile:
+                parent_profile.enable()
+
+    def dump(self, profile: cProfile.Profile, number: int, name: str) -> Path:
+        assert self.pstats_dir
+        slug = re.sub(r"[^\w.-]+", "-", name).strip("-")
+        path = self.pstats_dir / f"{number:02}-{slug}.pstats"
+        profile.dump_stats(path)
+        return path
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns the stages in the order they started,
+        and the wall time from the start to the stop of the profiler.
+        The objects are the ones tracked by the garbage collector (containers).
+        """
+        return {
+            "wall_time": self.wall_time,
+            "stages": self.stages,
+        }
+
+    def write(self, output_file: Path | str) -> None:
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, "w") as fd:
+            json.dump(self.report(), fd, indent=2)
+            fd.write("\n")
@@ -0,0 +1,97 @@
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from src.misc import SubmissionState
+
+
+class Projection:
+    """
+    Cheap pre-pass on the raw Pretalx records, before any model is built:
+    drops the records that are not going to be published, and the fields
+    (and localisations) that the pipeline never uses.
+    """
+
+    publishable_states = {
+        SubmissionState.accepted.value,
+        SubmissionState.confirmed.value,
+    }
+    state_pattern = re.compile(rb'"state"\s*:\s*"([a-z]+)"')
+
+    submission_fields = [
+        "code",
+        "title",
+        "speakers",
+        "submission_type",
+        "track",
+        "state",
+        "abstract",
+        "duration",
+        "resources",
+        "answers",
+        "slot",
+        "slot_count",
+    ]
+    speaker_fields = ["code", "name", "biography", "avatar", "submissions", "answers"]
+
+    @staticmethod
+    def skip_submission_line(line: bytes) -> bool:
+        """
+        Whether a JSONL line is a submission that is not publishable,
+        by reading only its state.
+
+        Only the lines with a single "state" key are checked, so that a nested one
+        can never be mistaken for the state of the submission.
+        """
+        if line.count(b'"state"') != 1:
+            return False
+        match = Projection.state_pattern.search(line)
+        return bool(match) and match[1].decode() not in Projection.publishable_states
+
+    @staticmethod
+    def is_publishable(record: dict[str, Any]) -> bool:
+        return record.get("state") in Projection.publishable_states
+
+    @staticmethod
+    def localized(value: Any, languages: Iterable[str]) -> Any:
+        if isinstance(value, dict):
+            return {k: v for k, v in value.items() if k in languages}
+        return value
+
+    @staticmethod
+    def answer(answer: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "question": {"question": {"en": answer["question"]["question"]["en"]}},
+            "answer": answer["answer"],
+            "answer_file": answer["answer_file"],
+            "submission": answer["submission"],
+            "person": answer["person"],
+        }
+
+    @staticmethod
+    def submission(record: dict[str, Any]) -> dict[str, Any]:
+        projected = {k: record[k] for k in Projection.submission_fields if k in record}
+
+        # Only the codes of the speakers are used, not their emails etc.
+        projected["speakers"] = [{"code": s["code"]} for s in record["speakers"]]
+
+        # See PretalxSubmission.handle_localized
+        for key in ("submission_type", "track"):
+            if key in projected:
+                projected[key] = Projection.localized(projected[key], ("en", "es"))
+
+        if slot := record.get("slot"):
+            projected["slot"] = {
+                k: Projection.localized(v, ("en",)) if k == "room" else v
+                for k, v in slot.items()
+                if k in ("room", "start", "end")
+            }
+
+        projected["answers"] = [Projection.answer(a) for a in record["answers"]]
+        return projected
+
+    @staticmethod
+    def speaker(record: dict[str, Any]) -> dict[str, Any]:
+        projected = {k: record[k] for k in Projection.speaker_fields if k in record}
+        projected["answers"] = [Projection.answer(a) for a in record["answers"]]
+        return projected
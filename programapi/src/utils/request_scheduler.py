@@ -0,0 +1,181 @@
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TypeVar
+
+import requests
+
+T = TypeVar("T")
+
+
+class PretalxAPIError(Exception):
+    """
+    Raised for an unexpected response from the Pretalx API
+    """
+
+    def __init__(
+        self, status_code: int, text: str, retry_after: str | None = None
+    ) -> None:
+        super().__init__(f"Error {status_code}: {text}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def is_retryable(self) -> bool:
+        return self.status_code in RequestScheduler.retryable_status_codes
+
+
+@dataclass
+class ResourceStats:
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    started: float | None = None
+    finished: float | None = None
+
+    @property
+    def wall_time(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class RequestScheduler:
+    """
+    Runs blocking requests in worker threads, with an adaptive concurrency limit:
+
+    - On a 429 the limit is halved, and all requests wait for ``Retry-After``
+    - When the latency grows well above the best one seen, the limit is lowered a bit
+    - Otherwise the limit is raised by about one request per round trip
+
+    Failed requests (429, 5xx, connection errors) are retried with jittered
+    exponential backoff, up to ``max_retries`` times.
+    """
+
+    retryable_status_codes = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        max_retries: int = 8,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0,
+        latency_slowdown: float = 4.0,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.latency_slowdown = latency_slowdown
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.best_latency: float | None = None
+        self.condition = asyncio.Condition()
+        self.stats: dict[str, ResourceStats] = {}
+
+    @staticmethod
+    def retry_after_seconds(retry_after: str | None) -> float | None:
+        """
+        Parses the Retry-After header, which is either seconds or an HTTP date
+        """
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full jitter: a random delay up to the exponential backoff of the attempt
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def acquire(self) -> None:
+        while (delay := self.paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        if self.best_latency is None or latency < self.best_latency:
+            self.best_latency = latency
+
+        if latency > self.best_latency * self.latency_slowdown:
+            self.limit = max(self.min_concurrency, self.limit * 0.9)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def on_rate_limited(self, retry_after: float | None) -> None:
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        if retry_after is not None:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    async def run(self, name: str, request: Callable[[], T]) -> T:
+        """
+        Runs the given blocking request, accounted to the resource with the given name
+        """
+        stats = self.stats.setdefault(name, ResourceStats())
+        if stats.started is None:
+            stats.started = time.monotonic()
+
+        attempt = 0
+        while True:
+            await self.acquire()
+            stats.requests += 1
+            started = time.monotonic()
+            try:
+                result = await asyncio.to_thread(request)
+            except PretalxAPIError as e:
+                if not e.is_retryable or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                if e.status_code == 429:
+                    stats.rate_limited += 1
+                    retry_after = self.retry_after_seconds(e.retry_after)
+                    self.on_rate_limited(retry_after)
+                    if retry_after is not None:
+                        delay = retry_after + random.uniform(0, self.backoff_base)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                self.on_success(time.monotonic() - started)
+                stats.finished = time.monotonic()
+                return result
+            finally:
+                await self.release()
+
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(delay)
+
+    def report(self) -> str:
+        lines = [
+            f"{name}: {s.requests} requests, {s.retries} retries "
+            f"({s.rate_limited} rate limited) in {s.wall_time:.2f}s"
+            for name, s in self.stats.items()
+        ]
+        lines.append(f"Final concurrency: {int(self.limit)}/{self.max_concurrency}")
+        return "\n".join(lines)
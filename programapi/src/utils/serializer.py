@@ -0,0 +1,187 @@
+import types
+import typing
+from collections.abc import Callable
+from functools import cache
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class Rule:
+    """
+    How the data of a type is ordered in the output: ``order`` is how a list is
+    sorted (see below), ``fields`` the rules of the fields of a model, and ``items``
+    the rule of the items of a list or of the values of a dict.
+
+    The order of a list is declared by its model, in ``list_order``:
+    ``()`` to sort the items by value, a tuple of keys to sort dicts by them,
+    the items being kept in insertion order for the lists without one.
+    """
+
+    def __init__(self) -> None:
+        self.order: tuple[str, ...] | None = None
+        self.fields: dict[str, "Rule"] = {}
+        self.items: Rule | None = None
+
+    def merge(self, other: "Rule") -> "Rule":
+        """
+        Returns the rule of data that can be of the type of either rule (a union)
+        """
+        merged = Rule()
+        merged.order = self.order if self.order is not None else other.order
+        merged.fields = dict(self.fields)
+        for name, field_rule in other.fields.items():
+            if name in merged.fields:
+                field_rule = merged.fields[name].merge(field_rule)
+            merged.fields[name] = field_rule
+        if self.items and other.items:
+            merged.items = self.items.merge(other.items)
+        else:
+            merged.items = self.items or other.items
+        return merged
+
+
+class Serializer:
+    """
+    Writes JSON with the keys of the objects sorted, and formatted like json.dump
+    with ``indent=2``, in a single pass over the data: the lists are ordered
+    according to the rules of their models as they are encoded.
+    """
+
+    # The encoders of the values that are not containers, by exact type
+    scalars: dict[type, Callable[[Any], str]] = {
+        str: encode_basestring_ascii,
+        int: int.__repr__,
+        bool: lambda value: "true" if value else "false",
+        type(None): lambda value: "null",
+        float: lambda value: Serializer.encode_float(value),
+    }
+
+    @staticmethod
+    def write(output_file: Path | str, data: Any, data_type: Any) -> None:
+        """
+        Writes the given data, as returned by ``model_dump(mode="json")``
+        for data of the given type (a model, or a list or dict of models)
+        """
+        with open(output_file, "w") as fd:
+            Serializer.encode(data, fd.write, Serializer.rule(data_type))
+
+    @staticmethod
+    def dumps(data: Any, data_type: Any = None) -> str:
+        chunks: list[str] = []
+        Serializer.encode(data, chunks.append, Serializer.rule(data_type))
+        return "".join(chunks)
+
+    @staticmethod
+    @cache
+    def rule(data_type: Any) -> Rule | None:
+        """
+        Returns the rule of the given type, from the ``list_order`` of the models
+        in it, or None if there is nothing to order in it
+        """
+        rule = Rule()
+        origin = typing.get_origin(data_type)
+        arguments = typing.get_args(data_type)
+
+        if isinstance(data_type, type) and issubclass(data_type, BaseModel):
+            list_order = getattr(data_type, "list_order", {})
+            for name, field in data_type.model_fields.items():
+                field_rule = Serializer.rule(field.annotation)
+                if name in list_order:
+                    # The rules of the types are cached, and shared
+                    ordered = Rule()
+                    if field_rule:
+                        ordered.fields, ordered.items = (
+                            field_rule.fields,
+                            field_rule.items,
+                        )
+                    ordered.order = list_order[name]
+                    field_rule = ordered
+                if field_rule:
+                    rule.fields[name] = field_rule
+        elif origin in (typing.Union, types.UnionType):
+            # The rules of the types of the union (models, lists, ...) are merged
+            for argument in arguments:
+                argument_rule = Serializer.rule(argument)
+                if argument_rule:
+                    rule = rule.merge(argument_rule)
+        elif origin in (list, dict):
+            rule.items = Serializer.rule(arguments[-1])
+
+        if rule.fields or rule.items:
+            return rule
+        return None
+
+    @staticmethod
+    def encode(
+        data: Any, write: Callable[[str], Any], rule: Rule | None, indent: str = "\n"
+    ) -> None:
+        """
+        Writes the given data according to the given rule,
+        with ``indent`` being the newline and indentation of its level
+        """
+        scalars = Serializer.scalars
+        scalar = scalars.get(type(data))
+        if scalar:
+            write(scalar(data))
+        elif isinstance(data, dict):
+            if not data:
+                write("{}")
+                return
+            fields = rule.fields if rule else {}
+            items = rule.items if rule else None
+            inner = indent + "  "
+            separator = "{" + inner
+            for key, value in sorted(data.items()):
+                scalar = scalars.get(type(value))
+                if scalar:
+                    write(f"{separator}{encode_basestring_ascii(key)}: {scalar(value)}")
+                else:
+                    write(f"{separator}{encode_basestring_ascii(key)}: ")
+                    Serializer.encode(value, write, fields.get(key, items), inner)
+                separator = "," + inner
+            write(indent + "}")
+        elif isinstance(data, list):
+            if not data:
+                write("[]")
+                return
+            if rule and rule.order is not None:
+                data = Serializer.sort_list(data, rule.order)
+            inner = indent + "  "
+            encoders = [scalars.get(type(item)) for item in data]
+            if all(encoders):
+                encoded = [encoder(item) for encoder, item in zip(encoders, data)]
+                write(f"[{inner}{(',' + inner).join(encoded)}{indent}]")
+                return
+            items = rule.items if rule else None
+            separator = "[" + inner
+            for item in data:
+                write(separator)
+                Serializer.encode(item, write, items, inner)
+                separator = "," + inner
+            write(indent + "]")
+        else:
+            # The subclasses of the scalar types, like json.dump
+            for base in (bool, int, float, str):
+                if isinstance(data, base):
+                    write(Serializer.scalars[base](data))
+                    return
+            raise TypeError(f"{type(data).__name__} is not JSON serializable")
+
+    @staticmethod
+    def encode_float(value: float) -> str:
+        if value != value:
+            return "NaN"
+        if value == float("inf"):
+            return "Infinity"
+        if value == float("-inf"):
+            return "-Infinity"
+        return float.__repr__(value)
+
+    @staticmethod
+    def sort_list(data: list, keys: tuple[str, ...]) -> list:
+        if not keys:
+            return sorted(data)
+        return sorted(data, key=lambda item: tuple(item.get(key, "") for key in keys))
@@ -0,0 +1,134 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+from src.models.pretalx import PretalxSubmission
+
+
+class IntervalIndex:
+    """
+    Index of the scheduled sessions by time interval, built once to find the
+    sessions overlapping a given interval in O(log n + k), rather than by
+    testing every session.
+
+    The sessions are sorted by start, and a segment tree over them keeps
+    the latest end of each range, so that the ranges of sessions that all end
+    before the interval are skipped at once.
+    """
+
+    def __init__(self, sessions: Iterable[PretalxSubmission]) -> None:
+        # Sessions are kept in their original order, which the results follow
+        self.sessions = list(sessions)
+        order = sorted(
+            (i for i, s in enumerate(self.sessions) if s.start is not None),
+            key=lambda i: self.sessions[i].start,
+        )
+        self.order = order
+        self.starts = [self.sessions[i].start for i in order]
+        self.ends = [self.sessions[i].end for i in order]
+
+        # max_end[node] is the latest end of the sessions in the range of node,
+        # the root (1) covers them all, and node n covers the halves 2n and 2n+1
+        self.max_end: list[datetime | None] = [None] * (4 * max(len(order), 1))
+        if order:
+            self.build(1, 0, len(order))
+
+    def build(self, node: int, lo: int, hi: int) -> datetime:
+        if hi - lo == 1:
+            self.max_end[node] = self.ends[lo]
+        else:
+            mid = (lo + hi) // 2
+            self.max_end[node] = max(
+                self.build(2 * node, lo, mid), self.build(2 * node + 1, mid, hi)
+            )
+        return self.max_end[node]
+
+    def overlapping(self, start: datetime, end: datetime) -> list[int]:
+        """
+        Returns the (original) positions of the sessions that start before ``end``
+        and end after ``start``, in their original order
+        """
+        # Only the sessions starting before the end can overlap
+        count = bisect_left(self.starts, end)
+        found = []
+
+        stack = [(1, 0, len(self.order))] if count else []
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= count or self.max_end[node] <= start:
+                continue
+            if hi - lo == 1:
+                found.append(self.order[lo])
+            else:
+                mid = (lo + hi) // 2
+                stack.append((2 * node + 1, mid, hi))
+                stack.append((2 * node, lo, mid))
+
+        return sorted(found)
+
+
+class Timeline:
+    """
+    Index of the scheduled sessions by day (of the month) and by room, each room
+    sorted by start then by original position, to find the first session of every
+    room after or before a given time by bisection, rather than by sorting and
+    filtering all the sessions.
+    """
+
+    def __init__(self, sessions: Iterable[PretalxSubmission]) -> None:
+        self.days: dict[int, dict[str | None, list[tuple[datetime, int]]]] = {}
+        self.sessions = list(sessions)
+
+        for position, session in enumerate(self.sessions):
+            if session.start is None:
+                continue
+            rooms = self.days.setdefault(session.start.day, {})
+            rooms.setdefault(session.room, []).append((session.start, position))
+
+        self.starts: dict[int, dict[str | None, list[datetime]]] = {}
+        for day, rooms in self.days.items():
+            for room, entries in rooms.items():
+                entries.sort()
+                self.starts.setdefault(day, {})[room] = [start for start, _ in entries]
+
+    def first_after(
+        self, day: int, time: datetime, accept: Callable[[PretalxSubmission], bool]
+    ) -> list[tuple[datetime, int]]:
+        """
+        Returns the (start, position) of the first accepted session starting
+        at or after ``time`` in every room, on the given day
+        """
+        found = []
+        for room, entries in self.days.get(day, {}).items():
+            for index in range(bisect_left(self.starts[day][room], time), len(entries)):
+                if accept(self.sessions[entries[index][1]]):
+                    found.append(entries[index])
+                    break
+
+        return found
+
+    def last_before(
+        self, day: int, time: datetime, accept: Callable[[PretalxSubmission], bool]
+    ) -> list[tuple[datetime, int]]:
+        """
+        Returns the (start, position) of the last accepted session starting
+        at or before ``time`` in every room, on the given day.
+        Of the sessions starting at the same time, the first one is taken.
+        """
+        found = []
+        for room, entries in self.days.get(day, {}).items():
+            starts = self.starts[day][room]
+            end = bisect_right(starts, time)
+            while end:
+                # The sessions starting at the same time, in their original order
+                begin = bisect_left(starts, starts[end - 1])
+                entry = next(
+                    (e for e in entries[begin:end] if accept(self.sessions[e[1]])),
+                    None,
+                )
+                if entry:
+                    found.append(entry)
+                    break
+                end = begin
+
+        return found
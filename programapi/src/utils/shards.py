@@ -0,0 +1,150 @@
+from datetime import date
+from typing import Any
+
+from pydantic import BaseModel
+from slugify import slugify
+
+from src.misc import Room
+from src.models.europython import (
+    DaySchedule,
+    EuroPythonSession,
+    EuroPythonSpeaker,
+    Schedule,
+)
+from src.utils.compression import Compression
+from src.utils.output_writer import OutputWriter
+from src.utils.serializer import Serializer
+
+
+class Shards:
+    """
+    Writes the sessions, speakers and schedule, next to the files with all of them,
+    as one file per session (sessions/<code>.json), per speaker
+    (speakers/<code>.json), per day (schedule/<date>.json) and per room of
+    every day (schedule/<date>/<room>.json), and an index of them (index.json),
+    so that clients can fetch only what they need.
+    """
+
+    directories = ["sessions", "speakers", "schedule"]
+    index_file = "index.json"
+    # Their own manifest, to keep the one of the writer small
+    manifest_file = "shards-manifest.json"
+
+    @staticmethod
+    def files(
+        ep_sessions: dict[str, EuroPythonSession],
+        ep_speakers: dict[str, EuroPythonSpeaker],
+        ep_schedule: Schedule,
+    ) -> dict[str, tuple[BaseModel, type[BaseModel]]]:
+        """
+        Returns the model (and its type) of every file,
+        by path relative to the output directory
+        """
+        files: dict[str, tuple[BaseModel, type[BaseModel]]] = {}
+        for code, session in ep_sessions.items():
+            files[f"sessions/{code}.json"] = (session, EuroPythonSession)
+        for code, speaker in ep_speakers.items():
+            files[f"speakers/{code}.json"] = (speaker, EuroPythonSpeaker)
+
+        for day, day_schedule in ep_schedule.days.items():
+            files[f"schedule/{day}.json"] = (day_schedule, DaySchedule)
+            for room in day_schedule.rooms:
+                room_schedule = DaySchedule(
+                    rooms=[room],
+                    events=[e for e in day_schedule.events if room in e.rooms],
+                )
+                files[Shards.room_file(day, room)] = (room_schedule, DaySchedule)
+
+        return files
+
+    @staticmethod
+    def room_file(day: date, room: Room) -> str:
+        return f"schedule/{day}/{slugify(room.value)}.json"
+
+    @staticmethod
+    def index(
+        ep_sessions: dict[str, EuroPythonSession],
+        ep_speakers: dict[str, EuroPythonSpeaker],
+        ep_schedule: Schedule,
+        hashes: dict[str, str],
+    ) -> dict[str, Any]:
+        """
+        Returns the path and SHA-256 of the files of every session, speaker, day,
+        and room of every day, so that clients can tell which ones changed
+        """
+
+        def entry(name: str) -> dict[str, str]:
+            return {"path": name, "sha256": hashes[name]}
+
+        return {
+            "sessions": {code: entry(f"sessions/{code}.json") for code in ep_sessions},
+            "speakers": {code: entry(f"speakers/{code}.json") for code in ep_speakers},
+            "schedule": {
+                str(day): entry(f"schedule/{day}.json")
+                | {
+                    "rooms": {
+                        room.value: entry(Shards.room_file(day, room))
+                        for room in day_schedule.rooms
+                    }
+                }
+                for day, day_schedule in ep_schedule.days.items()
+            },
+        }
+
+    @staticmethod
+    def writer(writer: OutputWriter) -> OutputWriter:
+        """
+        Returns the writer of the files, with their own manifest,
+        next to the one of the given writer
+        """
+        return OutputWriter(
+            writer.output_dir,
+            skip_unchanged=writer.skip_unchanged,
+            manifest_file=Shards.manifest_file if writer.manifest_file else None,
+        )
+
+    @staticmethod
+    def write(
+        writer: OutputWriter,
+        ep_sessions: dict[str, EuroPythonSession],
+        ep_speakers: dict[str, EuroPythonSpeaker],
+        ep_schedule: Schedule,
+    ) -> OutputWriter:
+        """
+        Writes the (small) files, removes the ones of the sessions, speakers and days
+        that are gone, and writes the index with the given writer.
+
+        The files are compared with the hashes of their own manifest rather than
+        read again. Returns the writer of the files, to save its manifest once
+        the files are compressed too (see Compression).
+        """
+        files = Shards.files(ep_sessions, ep_speakers, ep_schedule)
+        shard_writer = Shards.writer(writer)
+        for name, (model, model_type) in files.items():
+            shard_writer.write_text(
+                writer.output_dir / name,
+                Serializer.dumps(model.model_dump(mode="json"), model_type),
+            )
+
+        # With their compressed copies, see Compression
+        keep = set(files) | {
+            sibling for name in files for sibling in Compression.siblings(name)
+        }
+        for directory in Shards.directories:
+            shard_writer.prune(writer.output_dir / directory, keep=keep)
+
+        hashes = {
+            name: (
+                shard_writer.manifest[name]["sha256"]
+                if name in shard_writer.manifest
+                else OutputWriter.file_hash(writer.output_dir / name)
+            )
+            for name in files
+        }
+        index = Shards.index(ep_sessions, ep_speakers, ep_schedule, hashes)
+        writer.write(
+            writer.output_dir / Shards.index_file,
+            lambda path: Serializer.write(path, index, None),
+        )
+
+        return shard_writer
@@ -0,0 +1,226 @@
+import json
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from src.models.europython import (
+    EuroPythonScheduleBreak,
+    EuroPythonSession,
+    EuroPythonSpeaker,
+    Schedule,
+)
+from src.utils.output_writer import OutputWriter
+
+
+class SQLiteExport:
+    """
+    Writes the sessions, speakers and breaks to a SQLite database next to the JSON
+    files, for the clients that query them (the sessions of a room between two
+    times, the sessions of a speaker, ...) instead of scanning the files.
+
+    The times are stored like in the JSON files (ISO 8601, in UTC), so that they
+    can be compared as text. The database is built in a single transaction, in a
+    temporary file renamed over the previous one, so it can be opened read-only
+    (``sqlite3.connect("file:program.sqlite3?mode=ro", uri=True)``) at any time.
+    """
+
+    file_name = "program.sqlite3"
+
+    schema = """
+        CREATE TABLE sessions (
+            code TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            slug TEXT NOT NULL,
+            session_type TEXT NOT NULL,
+            track TEXT,
+            abstract TEXT NOT NULL,
+            duration TEXT NOT NULL,
+            level TEXT NOT NULL,
+            resources TEXT,  -- JSON
+            room TEXT,
+            start TEXT,
+            end TEXT,
+            next_session TEXT,
+            prev_session TEXT,
+            youtube_url TEXT
+        );
+        CREATE TABLE speakers (
+            code TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            biography TEXT,
+            avatar TEXT NOT NULL,
+            slug TEXT NOT NULL,
+            twitter_url TEXT,
+            mastodon_url TEXT,
+            instagram_url TEXT,
+            linkedin_url TEXT
+        );
+        CREATE TABLE session_speakers (
+            session_code TEXT NOT NULL REFERENCES sessions (code),
+            speaker_code TEXT NOT NULL REFERENCES speakers (code),
+            PRIMARY KEY (session_code, speaker_code)
+        ) WITHOUT ROWID;
+        -- One row per room of every break
+        CREATE TABLE breaks (
+            title TEXT NOT NULL,
+            room TEXT NOT NULL,
+            start TEXT NOT NULL,
+            end TEXT NOT NULL,
+            duration INTEGER NOT NULL
+        );
+        -- The sessions in parallel, after and before every session
+        CREATE TABLE relationships (
+            session_code TEXT NOT NULL REFERENCES sessions (code),
+            kind TEXT NOT NULL CHECK (kind IN ('parallel', 'after', 'before')),
+            related_code TEXT NOT NULL REFERENCES sessions (code),
+            PRIMARY KEY (session_code, kind, related_code)
+        ) WITHOUT ROWID;
+    """
+
+    # Created after the rows are inserted, which is faster than updating them
+    indexes = [
+        "CREATE INDEX sessions_start ON sessions (start)",
+        "CREATE INDEX sessions_room_start ON sessions (room, start)",
+        "CREATE INDEX sessions_slug ON sessions (slug)",
+        "CREATE INDEX speakers_slug ON speakers (slug)",
+        "CREATE INDEX session_speakers_speaker ON session_speakers (speaker_code)",
+        "CREATE INDEX breaks_start ON breaks (start)",
+        "CREATE INDEX breaks_room_start ON breaks (room, start)",
+    ]
+
+    # The times, as pydantic writes them to the JSON files
+    timestamp = TypeAdapter(datetime | None)
+
+    @staticmethod
+    def iso(value: datetime | None) -> str | None:
+        return SQLiteExport.timestamp.dump_python(value, mode="json")
+
+    @staticmethod
+    def breaks(ep_schedule: Schedule) -> Iterator[tuple[Any, ...]]:
+        for day_schedule in ep_schedule.days.values():
+            for event in day_schedule.events:
+                if not isinstance(event, EuroPythonScheduleBreak):
+                    continue
+                end = SQLiteExport.iso(event.start + timedelta(minutes=event.duration))
+                for room in sorted(room.value for room in event.rooms):
+                    yield (
+                        event.title,
+                        room,
+                        SQLiteExport.iso(event.start),
+                        end,
+                        event.duration,
+                    )
+
+    @staticmethod
+    def build(
+        database_file: Path | str,
+        ep_sessions: dict[str, EuroPythonSession],
+        ep_speakers: dict[str, EuroPythonSpeaker],
+        ep_schedule: Schedule,
+    ) -> None:
+        """
+        Builds the database in the given (new or empty) file
+        """
+        iso = SQLiteExport.iso
+        # The transaction is managed here, executescript would commit it
+        connection = sqlite3.connect(database_file, isolation_level=None)
+        try:
+            # The file is only used once complete, see write
+            connection.executescript(
+                "PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;"
+                "BEGIN;" + SQLiteExport.schema
+            )
+            connection.executemany(
+                "INSERT INTO sessions VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        s.code,
+                        s.title,
+                        s.slug,
+                        s.session_type,
+                        s.track,
+                        s.abstract,
+                        s.duration,
+                        s.level,
+                        json.dumps(s.resources) if s.resources is not None else None,
+                        s.room,
+                        iso(s.start),
+                        iso(s.end),
+                        s.next_session,
+                        s.prev_session,
+                        s.youtube_url,
+                    )
+                    for s in ep_sessions.values()
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO speakers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        s.code,
+                        s.name,
+                        s.biography,
+                        s.avatar,
+                        s.slug,
+                        s.twitter_url,
+                        s.mastodon_url,
+                        s.instagram_url,
+                        s.linkedin_url,
+                    )
+                    for s in ep_speakers.values()
+                ),
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO session_speakers VALUES (?, ?)",
+                (
+                    (code, speaker_code)
+                    for code, s in ep_sessions.items()
+                    for speaker_code in s.speakers
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO breaks VALUES (?, ?, ?, ?, ?)",
+                SQLiteExport.breaks(ep_schedule),
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO relationships VALUES (?, ?, ?)",
+                (
+                    (code, kind, related_code)
+                    for code, s in ep_sessions.items()
+                    for kind, related in [
+                        ("parallel", s.sessions_in_parallel),
+                        ("after", s.sessions_after),
+                        ("before", s.sessions_before),
+                    ]
+                    for related_code in related or []
+                ),
+            )
+            for statement in SQLiteExport.indexes:
+                connection.execute(statement)
+            connection.execute("ANALYZE")
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def write(
+        writer: OutputWriter,
+        ep_sessions: dict[str, EuroPythonSession],
+        ep_speakers: dict[str, EuroPythonSpeaker],
+        ep_schedule: Schedule,
+    ) -> bool:
+        """
+        Writes the database to the output directory of the given writer,
+        unless it is the same as before. Returns whether it was written.
+        """
+        return writer.write(
+            writer.output_dir / SQLiteExport.file_name,
+            lambda path: SQLiteExport.build(
+                path, ep_sessions, ep_speakers, ep_schedule
+            ),
+        )
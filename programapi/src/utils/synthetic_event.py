@@ -0,0 +1,326 @@
+import json
+import math
+import random
+import string
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from src.misc import Room, SpeakerQuestion, SubmissionQuestion
+
+LANGUAGES = ["de", "en", "es", "ja-jp", "pt-pt", "zh-hant"]
+
+WORDS = (
+    "python data async typing packaging testing web api cloud science "
+    "community learning performance security teaching open source pandas "
+    "django flask fastapi numpy rust wasm parsing models pipelines"
+).split()
+
+FIRST_NAMES = "Ada Grace Katherine Mary Radia Barbara Frances Jean Hedy Joan".split()
+LAST_NAMES = "Lovelace Hopper Johnson Keller Perlman Liskov Allen Sammet Lamarr".split()
+
+# Minutes between the first and the last slot of multi-slot sessions,
+# mirroring Utils.start_times
+WORKSHOP_SPANS = {2: 90 + 15 + 90, 4: 90 + 15 + 90 + 60 + 90 + 15 + 90}
+
+
+class SyntheticEvent:
+    """
+    Generates a fake Pretalx event of any size, in the shapes returned by the
+    Pretalx API (and expected by PretalxSubmission, PretalxSpeaker and PretalxSchedule).
+
+    The publishable sessions are scheduled back to back between ``day_start`` and
+    ``day_end`` of the ``days`` days, in ``tracks`` sessions at the same time in
+    every room: like at a real conference, a larger event has more sessions in
+    parallel rather than more days. The tracks grow to fit all the sessions unless
+    ``tracks`` is given, in which case the sessions that do not fit stay
+    unscheduled. The rooms are the ones in ``Room``, the only ones the EuroPython
+    schedule accepts.
+    """
+
+    states = {
+        "confirmed": 0.4,
+        "accepted": 0.1,
+        "rejected": 0.3,
+        "withdrawn": 0.1,
+        "submitted": 0.1,
+    }
+
+    def __init__(
+        self,
+        submissions: int = 1000,
+        speakers: int | None = None,
+        rooms: int = len(Room),
+        days: int = 3,
+        tracks: int | None = None,
+        answers: int = 3,
+        workshop_ratio: float = 0.05,
+        seed: int = 0,
+        first_day: datetime = datetime(2099, 7, 8, tzinfo=timezone.utc),
+        day_start: int = 9,
+        day_end: int = 18,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.n_submissions = submissions
+        self.n_speakers = speakers or max(1, math.ceil(submissions * 0.8))
+        if not 1 <= rooms <= len(Room):
+            raise ValueError(f"The event can only have 1 to {len(Room)} rooms")
+        self.rooms = [room.value for room in Room][:rooms]
+        self.days = days
+        self.tracks = tracks
+        self.n_answers = answers
+        self.workshop_ratio = workshop_ratio
+        self.first_day = first_day
+        self.day_start = day_start
+        self.day_end = day_end
+
+        self.used_codes: set[str] = set()
+        self.question_ids: dict[str, int] = {}
+
+        self.speakers = [self.speaker() for _ in range(self.n_speakers)]
+        self.submissions = [self.submission() for _ in range(self.n_submissions)]
+        self.breaks: list[dict[str, Any]] = []
+        self.schedule_sessions()
+
+    def code(self) -> str:
+        while True:
+            code = "".join(
+                self.rng.choices(string.ascii_uppercase + string.digits, k=6)
+            )
+            if code not in self.used_codes:
+                self.used_codes.add(code)
+                return code
+
+    def words(self, n: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=n))
+
+    def localized(self, text: str) -> dict[str, str]:
+        return {language: text for language in LANGUAGES}
+
+    def answer(
+        self, question: str, answer: str, submission: str | None, person: str | None
+    ) -> dict[str, Any]:
+        question_id = self.question_ids.setdefault(
+            question, 4000 + len(self.question_ids)
+        )
+        return {
+            "id": self.rng.randrange(100_000, 999_999),
+            "question": {"id": question_id, "question": self.localized(question)},
+            "answer": answer,
+            "answer_file": None,
+            "submission": submission,
+            "review": None,
+            "person": person,
+            "options": [],
+        }
+
+    def speaker(self) -> dict[str, Any]:
+        code = self.code()
+        handle = code.lower()
+        # No Instagram answers, EuroPythonSpeaker cannot extract them (yet)
+        answers = [
+            self.answer(
+                SpeakerQuestion.mastodon, f"@{handle}@mastodon.social", None, code
+            ),
+            self.answer(SpeakerQuestion.twitter, f"@{handle}", None, code),
+            self.answer(SpeakerQuestion.linkedin, f"in/{handle}", None, code),
+        ]
+        answers += [
+            self.answer(f"Question {n}", self.words(5), None, code)
+            for n in range(self.n_answers)
+        ]
+
+        return {
+            "code": code,
+            "name": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+            "biography": self.words(40) if self.rng.random() < 0.9 else None,
+            "submissions": [],
+            "avatar": f"https://pretalx.com/media/avatars/{code}.jpg",
+            "answers": answers,
+            "email": f"{handle}@example.com",
+            "availabilities": [],
+        }
+
+    def submission(self) -> dict[str, Any]:
+        code = self.code()
+        speakers = self.rng.sample(
+            self.speakers, k=min(len(self.speakers), self.rng.choice([1, 1, 1, 2]))
+        )
+        for speaker in speakers:
+            speaker["submissions"].append(code)
+
+        submission_type, duration, slot_count = "Talk", 30, 1
+        if self.rng.random() < self.workshop_ratio:
+            slot_count = self.rng.choice([2, 4])
+            submission_type, duration = "Workshop", 90 * slot_count
+
+        answers = [
+            self.answer(
+                SubmissionQuestion.level,
+                self.rng.choice(["Beginner", "Intermediate", "Advanced"]),
+                code,
+                None,
+            ),
+            self.answer(SubmissionQuestion.topic, self.words(3), code, None),
+        ]
+        answers += [
+            self.answer(f"Question {n}", self.words(5), code, None)
+            for n in range(self.n_answers)
+        ]
+
+        return {
+            "code": code,
+            "speakers": [
+                {
+                    "code": speaker["code"],
+                    "name": speaker["name"],
+                    "biography": speaker["biography"],
+                    "avatar": speaker["avatar"],
+                    "email": speaker["email"],
+                }
+                for speaker in speakers
+            ],
+            "title": self.words(self.rng.randint(3, 8)).capitalize(),
+            "submission_type": self.localized(submission_type),
+            "submission_type_id": 4700 + slot_count,
+            "track": {"en": self.words(2).title()},
+            "track_id": 4400,
+            "state": self.rng.choices(
+                list(self.states), weights=list(self.states.values())
+            )[0],
+            "abstract": self.words(60),
+            "description": self.words(150),
+            "duration": duration,
+            "slot_count": slot_count,
+            "do_not_record": False,
+            "is_featured": False,
+            "content_locale": "en",
+            "slot": None,
+            "image": None,
+            "resources": [],
+            "answers": answers,
+        }
+
+    def slot(self, room: str, start: datetime, minutes: int) -> dict[str, Any]:
+        return {
+            "room_id": 3600 + self.rooms.index(room),
+            "room": {"en": room},
+            "start": start.isoformat().replace("+00:00", "Z"),
+            "end": (start + timedelta(minutes=minutes))
+            .isoformat()
+            .replace("+00:00", "Z"),
+        }
+
+    def plan(self, durations: list[int], tracks: int) -> list[tuple[int, int, int]]:
+        """
+        Returns the day, lane and start (in minutes of the day) of the sessions of
+        the given durations, back to back in the lanes (``tracks`` in every room,
+        room after room), for as many of them as fit in the days
+        """
+        plan = []
+        day = lane = 0
+        cursor = self.day_start * 60
+        for minutes in durations:
+            if cursor + minutes > self.day_end * 60:
+                lane += 1
+                cursor = self.day_start * 60
+                if lane == len(self.rooms) * tracks:
+                    lane = 0
+                    day += 1
+            if day >= self.days:
+                break
+            plan.append((day, lane, cursor))
+            cursor += minutes
+        return plan
+
+    def schedule_sessions(self) -> None:
+        """
+        Puts the publishable submissions in the rooms back to back,
+        starting every day with a keynote and some announcements
+        """
+        publishable = [
+            s for s in self.submissions if s["state"] in ("confirmed", "accepted")
+        ]
+        durations = [
+            (
+                WORKSHOP_SPANS[submission["slot_count"]]
+                if submission["slot_count"] > 1
+                else int(submission["duration"])
+            )
+            for submission in publishable
+        ]
+
+        tracks = self.tracks
+        if tracks is None:
+            # From the tracks the sessions would fill without any gap
+            minutes_per_day = (self.day_end - self.day_start) * 60
+            tracks = max(
+                1,
+                math.ceil(
+                    sum(durations) / (minutes_per_day * len(self.rooms) * self.days)
+                ),
+            )
+            while len(plan := self.plan(durations, tracks)) < len(publishable):
+                tracks += 1
+        else:
+            plan = self.plan(durations, tracks)
+
+        day_opened: set[int] = set()
+        for submission, minutes, (day, lane, cursor) in zip(
+            publishable, durations, plan
+        ):
+            if day not in day_opened:
+                day_opened.add(day)
+                submission["submission_type"] = self.localized("Keynote")
+                self.add_breaks(day)
+            elif lane == tracks and cursor == self.day_start * 60:
+                # The first session of the second room
+                submission["submission_type"] = self.localized("Announcements")
+
+            start = self.first_day + timedelta(days=day, minutes=cursor)
+            room = self.rooms[lane // tracks]
+            submission["slot"] = self.slot(room, start, minutes)
+
+    def add_breaks(self, day: int) -> None:
+        lunch = self.first_day + timedelta(days=day, hours=12, minutes=30)
+        for room in self.rooms:
+            self.breaks.append(
+                {
+                    **self.slot(room, lunch, 60),
+                    "description": self.localized("Lunch"),
+                }
+            )
+
+    def schedule(self) -> dict[str, Any]:
+        return {
+            "slots": [
+                s
+                for s in self.submissions
+                if s["slot"] and s["state"] in ("confirmed", "accepted")
+            ],
+            "breaks": self.breaks,
+        }
+
+    def resources(self) -> dict[str, Any]:
+        """
+        Returns the resources to serve with FakePretalx
+        """
+        return {
+            "submissions": self.submissions,
+            "speakers": self.speakers,
+            "schedules/latest": self.schedule(),
+        }
+
+    def dump(self, raw_path: Path | str) -> None:
+        """
+        Writes the event like ``python -m src.download`` does
+        """
+        raw_path = Path(raw_path)
+        raw_path.mkdir(parents=True, exist_ok=True)
+        for filename, data in [
+            ("submissions_latest.json", self.submissions),
+            ("speakers_latest.json", self.speakers),
+            ("schedule_latest.json", self.schedule()),
+        ]:
+            with open(raw_path / filename, "w") as fd:
+                json.dump(data, fd)
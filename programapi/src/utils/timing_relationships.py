@@ -1,81 +1,235 @@
-from collections.abc import ValuesView
+from collections.abc import Iterable, ValuesView
+from datetime import datetime
 
+from src.config import Config
 from src.models.pretalx import PretalxSubmission
+from src.utils.numpy_timing import NumpyTiming
+from src.utils.session_index import IntervalIndex, Timeline
 
 
 class TimingRelationships:
-    all_sessions_in_parallel: dict[str, list[str]] = {}
-    all_sessions_after: dict[str, list[str]] = {}
-    all_sessions_before: dict[str, list[str]] = {}
-    all_next_session: dict[str, str | None] = {}
-    all_prev_session: dict[str, str | None] = {}
+    """
+    The sessions in parallel, after and before each session of an event,
+    and its previous and next sessions, by session code
+    """
+
+    def __init__(self) -> None:
+        self.all_sessions_in_parallel: dict[str, list[str]] = {}
+        self.all_sessions_after: dict[str, list[str]] = {}
+        self.all_sessions_before: dict[str, list[str]] = {}
+        self.all_next_session: dict[str, str | None] = {}
+        self.all_prev_session: dict[str, str | None] = {}
+
+        # The start and end of the sessions, as of the last computation
+        self.slots: dict[str, tuple[datetime | None, datetime | None]] = {}
 
     @classmethod
     def compute(
-        cls, all_sessions: ValuesView[PretalxSubmission] | list[PretalxSubmission]
-    ) -> None:
-        for session in all_sessions:
-            if not session.start or not session.end:
-                continue
+        cls,
+        all_sessions: ValuesView[PretalxSubmission] | list[PretalxSubmission],
+        backend: str | None = None,
+    ) -> "TimingRelationships":
+        relationships = cls()
+        relationships.update(all_sessions, backend=backend)
+        return relationships
+
+    def update(
+        self,
+        all_sessions: ValuesView[PretalxSubmission] | list[PretalxSubmission],
+        changed_codes: Iterable[str] | None = None,
+        backend: str | None = None,
+    ) -> set[str]:
+        """
+        Recomputes the relationships of the sessions affected by the changed ones
+        (moved, edited, added or removed since the last computation), or of all
+        the sessions if ``changed_codes`` is None.
 
-            sessions_in_parallel = cls.compute_sessions_in_parallel(
-                session, all_sessions
-            )
-            sessions_after = cls.compute_sessions_after(
-                session, all_sessions, sessions_in_parallel
-            )
-            sessions_before = cls.compute_sessions_before(
-                session, all_sessions, sessions_in_parallel
-            )
+        The affected sessions are the changed ones, the ones on the same day
+        as them (before or after the change), and the ones overlapping them.
+        The other sessions are expected to be in the same order as before.
+
+        The ``backend`` is "python" or "numpy" (see NumpyTiming). By default,
+        NumPy is used for full computations of at least Config.numpy_timing_threshold
+        sessions, if it is installed.
 
-            cls.all_sessions_in_parallel[session.code] = sessions_in_parallel
-            cls.all_sessions_after[session.code] = sessions_after
-            cls.all_sessions_before[session.code] = sessions_before
-            cls.all_next_session[session.code] = cls.compute_prev_or_next_session(
-                session, sessions_after, all_sessions
+        Returns the codes of the recomputed sessions.
+        """
+        all_sessions = list(all_sessions)
+        if backend is None:
+            backend = (
+                "numpy"
+                if changed_codes is None
+                and len(all_sessions) >= Config.numpy_timing_threshold
+                and NumpyTiming.supports(all_sessions)
+                else "python"
             )
-            cls.all_prev_session[session.code] = cls.compute_prev_or_next_session(
-                session, sessions_before, all_sessions
+        elif backend == "numpy" and not NumpyTiming.supports(all_sessions):
+            raise ValueError("These sessions cannot be handled by NumpyTiming")
+
+        if backend == "numpy":
+            affected_codes = {s.code for s in all_sessions} | set(self.slots)
+        else:
+            interval_index = IntervalIndex(all_sessions)
+            timeline = Timeline(all_sessions)
+            sessions_by_code = self.index_by_code(all_sessions)
+
+            if changed_codes is None:
+                affected_codes = set(sessions_by_code) | set(self.slots)
+            else:
+                affected_codes = self.affected_codes(
+                    set(changed_codes), interval_index, timeline, sessions_by_code
+                )
+
+        results = [
+            self.all_sessions_in_parallel,
+            self.all_sessions_after,
+            self.all_sessions_before,
+            self.all_next_session,
+            self.all_prev_session,
+        ]
+        for code in affected_codes:
+            for result in results:
+                result.pop(code, None)
+
+        if backend == "numpy":
+            computed = NumpyTiming(all_sessions).compute().items()
+        else:
+            computed = (
+                (
+                    position,
+                    self.compute_session(
+                        session,
+                        all_sessions,
+                        interval_index,
+                        timeline,
+                        sessions_by_code,
+                    ),
+                )
+                for position, session in enumerate(all_sessions)
+                if session.code in affected_codes and session.start and session.end
             )
 
-    @classmethod
+        for position, relationships in computed:
+            code = all_sessions[position].code
+            for result, value in zip(results, relationships):
+                result[code] = value
+
+        # Keep the order of a full computation
+        for result in results:
+            ordered = {s.code: result[s.code] for s in all_sessions if s.code in result}
+            result.clear()
+            result.update(ordered)
+
+        self.slots = {s.code: (s.start, s.end) for s in all_sessions}
+
+        return affected_codes
+
+    def affected_codes(
+        self,
+        changed_codes: set[str],
+        interval_index: IntervalIndex,
+        timeline: Timeline,
+        sessions_by_code: dict[str, list[tuple[int, PretalxSubmission]]],
+    ) -> set[str]:
+        """
+        Returns the codes of the sessions whose relationships can be changed
+        by the changed sessions
+        """
+        slots = [self.slots[code] for code in changed_codes if code in self.slots]
+        slots += [
+            (session.start, session.end)
+            for code in changed_codes
+            for _, session in sessions_by_code.get(code, [])
+        ]
+
+        affected_codes = set(changed_codes)
+        for start, end in slots:
+            if start is None:
+                continue
+
+            # The sessions after and before are on the same day
+            for entries in timeline.days.get(start.day, {}).values():
+                affected_codes.update(
+                    timeline.sessions[position].code for _, position in entries
+                )
+
+            # The sessions in parallel may not be
+            if end is not None:
+                affected_codes.update(
+                    interval_index.sessions[position].code
+                    for position in interval_index.overlapping(start, end)
+                )
+
+        return affected_codes
+
     def get_sessions_in_parallel(
-        cls, session_code: str | None = None
+        self, session_code: str | None = None
     ) -> list[str] | None:
-        return cls.all_sessions_in_parallel.get(session_code)
+        return self.all_sessions_in_parallel.get(session_code)
 
-    @classmethod
-    def get_sessions_after(cls, session_code: str | None = None) -> list[str] | None:
-        return cls.all_sessions_after.get(session_code)
+    def get_sessions_after(self, session_code: str | None = None) -> list[str] | None:
+        return self.all_sessions_after.get(session_code)
 
-    @classmethod
-    def get_sessions_before(cls, session_code: str | None = None) -> list[str] | None:
-        return cls.all_sessions_before.get(session_code)
+    def get_sessions_before(self, session_code: str | None = None) -> list[str] | None:
+        return self.all_sessions_before.get(session_code)
 
-    @classmethod
-    def get_next_session(cls, session_code: str | None = None) -> str | None:
-        return cls.all_next_session.get(session_code)
+    def get_next_session(self, session_code: str | None = None) -> str | None:
+        return self.all_next_session.get(session_code)
+
+    def get_prev_session(self, session_code: str | None = None) -> str | None:
+        return self.all_prev_session.get(session_code)
 
     @classmethod
-    def get_prev_session(cls, session_code: str | None = None) -> str | None:
-        return cls.all_prev_session.get(session_code)
+    def compute_session(
+        cls,
+        session: PretalxSubmission,
+        all_sessions: list[PretalxSubmission],
+        interval_index: IntervalIndex,
+        timeline: Timeline,
+        sessions_by_code: dict[str, list[tuple[int, PretalxSubmission]]],
+    ) -> tuple[list[str], list[str], list[str], str | None, str | None]:
+        """
+        Returns the sessions in parallel, after and before the given session,
+        and its next and previous sessions
+        """
+        sessions_in_parallel = cls.compute_sessions_in_parallel(
+            session, all_sessions, interval_index
+        )
+        sessions_after = cls.compute_sessions_after(
+            session, all_sessions, sessions_in_parallel, timeline
+        )
+        sessions_before = cls.compute_sessions_before(
+            session, all_sessions, sessions_in_parallel, timeline
+        )
+        return (
+            sessions_in_parallel,
+            sessions_after,
+            sessions_before,
+            cls.compute_prev_or_next_session(
+                session, sessions_after, all_sessions, sessions_by_code
+            ),
+            cls.compute_prev_or_next_session(
+                session, sessions_before, all_sessions, sessions_by_code
+            ),
+        )
 
     @staticmethod
     def compute_sessions_in_parallel(
         session: PretalxSubmission,
         all_sessions: ValuesView[PretalxSubmission] | list[PretalxSubmission],
+        interval_index: IntervalIndex | None = None,
     ) -> list[str]:
-        sessions_parallel = []
-        for other_session in all_sessions:
-            if (
-                other_session.code == session.code
-                or other_session.start is None
-                or session.start is None
-            ):
-                continue
+        if session.start is None:
+            return []
+
+        if interval_index is None:
+            interval_index = IntervalIndex(all_sessions)
 
-            # If they intersect, they are in parallel
-            if other_session.start < session.end and other_session.end > session.start:
+        # If they intersect, they are in parallel
+        sessions_parallel = []
+        for position in interval_index.overlapping(session.start, session.end):
+            other_session = interval_index.sessions[position]
+            if other_session.code != session.code:
                 sessions_parallel.append(other_session.code)
 
         return sessions_parallel
@@ -85,34 +239,28 @@ class TimingRelationships:
         session: PretalxSubmission,
         all_sessions: ValuesView[PretalxSubmission] | list[PretalxSubmission],
         sessions_in_parallel: list[str],
+        timeline: Timeline | None = None,
     ) -> list[str]:
-        # Sort sessions based on start time, early first
-        all_sessions_sorted = sorted(
-            all_sessions, key=lambda x: (x.start is None, x.start)
-        )
-
-        # Filter out sessions
-        remaining_sessions = [
-            other_session
-            for other_session in all_sessions_sorted
-            if other_session.start is not None
-            and other_session.start >= session.end
-            and other_session.code not in sessions_in_parallel
+        if timeline is None:
+            timeline = Timeline(all_sessions)
+        sessions_in_parallel_codes = set(sessions_in_parallel)
+
+        # The first session in every room that starts after the end of this one,
+        # on the same day
+        first_sessions = timeline.first_after(
+            session.start.day,
+            session.end,
+            lambda other_session: other_session.code not in sessions_in_parallel_codes
             and other_session.code != session.code
-            and other_session.start.day == session.start.day
             and not other_session.submission_type
             == session.submission_type
-            == "Announcements"
-        ]
-
-        # Add sessions to the list if they are in different rooms
-        seen_rooms = set()
-        unique_sessions: list[PretalxSubmission] = []
+            == "Announcements",
+        )
 
-        for other_session in remaining_sessions:
-            if other_session.room not in seen_rooms:
-                unique_sessions.append(other_session)
-                seen_rooms.add(other_session.room)
+        # Early first
+        unique_sessions = [
+            timeline.sessions[position] for _, position in sorted(first_sessions)
+        ]
 
         # If there is a keynote next, only show that
         if any(s.submission_type == "Keynote" for s in unique_sessions):
@@ -130,42 +278,51 @@ class TimingRelationships:
         session: PretalxSubmission,
         all_sessions: ValuesView[PretalxSubmission] | list[PretalxSubmission],
         sessions_in_parallel: list[str],
+        timeline: Timeline | None = None,
     ) -> list[str]:
-        # Sort sessions based on start time, late first
-        all_sessions_sorted = sorted(
-            all_sessions,
-            key=lambda x: (x.start is None, x.start),
-            reverse=True,
+        if timeline is None:
+            timeline = Timeline(all_sessions)
+        sessions_in_parallel_codes = set(sessions_in_parallel)
+
+        # The last session in every room that starts before this one, on the same day
+        last_sessions = timeline.last_before(
+            session.start.day,
+            session.start,
+            lambda other_session: other_session.code not in sessions_in_parallel_codes
+            and other_session.code != session.code
+            and other_session.submission_type != "Announcements",
         )
 
-        remaining_sessions = [
-            other_session
-            for other_session in all_sessions_sorted
-            if other_session.start is not None
-            and other_session.code not in sessions_in_parallel
-            and other_session.start <= session.start
-            and other_session.code != session.code
-            and other_session.start.day == session.start.day
-            and other_session.submission_type != "Announcements"
+        # Late first, and in the original order for the same start
+        unique_sessions = [
+            timeline.sessions[position]
+            for _, position in sorted(
+                last_sessions, key=lambda entry: (entry[0], -entry[1]), reverse=True
+            )
         ]
 
-        seen_rooms = set()
-        unique_sessions: list[PretalxSubmission] = []
-
-        for other_session in remaining_sessions:
-            if other_session.room not in seen_rooms:
-                unique_sessions.append(other_session)
-                seen_rooms.add(other_session.room)
-
         sessions_before = [session.code for session in unique_sessions]
 
         return sessions_before
 
+    @staticmethod
+    def index_by_code(
+        all_sessions: ValuesView[PretalxSubmission] | list[PretalxSubmission],
+    ) -> dict[str, list[tuple[int, PretalxSubmission]]]:
+        """
+        Returns the sessions (and their positions) by code
+        """
+        sessions_by_code: dict[str, list[tuple[int, PretalxSubmission]]] = {}
+        for position, session in enumerate(all_sessions):
+            sessions_by_code.setdefault(session.code, []).append((position, session))
+        return sessions_by_code
+
     @staticmethod
     def compute_prev_or_next_session(
         session: PretalxSubmission,
         sessions_before_or_after: list[str],
         all_sessions: ValuesView[PretalxSubmission] | list[PretalxSubmission],
+        sessions_by_code: dict[str, list[tuple[int, PretalxSubmission]]] | None = None,
     ) -> str | None:
         """
         Compute next_session or prev_session based on the given sessions_before_or_after.
@@ -177,17 +334,16 @@ class TimingRelationships:
         if not sessions_before_or_after:
             return None
 
-        sessions_before_or_after_object = [
-            s for s in all_sessions if s.code in sessions_before_or_after
-        ]
+        if sessions_by_code is None:
+            sessions_by_code = TimingRelationships.index_by_code(all_sessions)
 
-        session_in_same_room = None
-        for other_session in sessions_before_or_after_object:
-            if (
-                other_session.room == session.room
-                or other_session.submission_type == "Keynote"
-            ):
-                session_in_same_room = other_session.code
-                break
+        # The first one, in the order of all_sessions
+        sessions_in_same_room = [
+            (position, other_session.code)
+            for code in set(sessions_before_or_after)
+            for position, other_session in sessions_by_code.get(code, [])
+            if other_session.room == session.room
+            or other_session.submission_type == "Keynote"
+        ]
 
-        return session_in_same_room
+        return min(sessions_in_same_room)[1] if sessions_in_same_room else None
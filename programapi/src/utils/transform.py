@@ -7,6 +7,7 @@ from src.models.europython import (
     Schedule,
 )
 from src.models.pretalx import PretalxScheduleBreak, PretalxSpeaker, PretalxSubmission
+from src.utils.profiler import Profiler
 from src.utils.timing_relationships import TimingRelationships
 from src.utils.utils import Utils
 
@@ -15,10 +16,12 @@ class Transform:
     @staticmethod
     def pretalx_submissions_to_europython_sessions(
         submissions: dict[str, PretalxSubmission],
+        timing_relationships: TimingRelationships,
         youtube_data: dict[str, str] = None,
     ) -> dict[str, EuroPythonSession]:
         """
-        Transforms the given Pretalx submissions to EuroPython sessions
+        Transforms the given Pretalx submissions to EuroPython sessions,
+        with the given timing relationships between them
         """
         # Sort the submissions based on start time for deterministic slug computation
         submissions = {
@@ -49,15 +52,15 @@ class Transform:
                 start=submission.start,
                 end=submission.end,
                 answers=submission.answers,
-                sessions_in_parallel=TimingRelationships.get_sessions_in_parallel(
+                sessions_in_parallel=timing_relationships.get_sessions_in_parallel(
                     submission.code
                 ),
-                sessions_after=TimingRelationships.get_sessions_after(submission.code),
-                sessions_before=TimingRelationships.get_sessions_before(
+                sessions_after=timing_relationships.get_sessions_after(submission.code),
+                sessions_before=timing_relationships.get_sessions_before(
                     submission.code
                 ),
-                next_session=TimingRelationships.get_next_session(submission.code),
-                prev_session=TimingRelationships.get_prev_session(submission.code),
+                next_session=timing_relationships.get_next_session(submission.code),
+                prev_session=timing_relationships.get_prev_session(submission.code),
                 slot_count=submission.slot_count,
                 #youtube_url=youtube_data.get(submission.code),
                 youtube_url="None",
@@ -150,4 +153,5 @@ class Transform:
 
                 ep_schedule_sessions_split.append(ep_schedule_session)
 
-        return Schedule.from_events(ep_breaks + ep_schedule_sessions_split)
+        with Profiler.stage("Schedule.from_events"):
+            return Schedule.from_events(ep_breaks + ep_schedule_sessions_split)
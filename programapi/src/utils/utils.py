@@ -1,15 +1,16 @@
-import json
 from collections import defaultdict
 from collections.abc import KeysView
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from pydantic import BaseModel
 from slugify import slugify
 
 from src.misc import Room
 from src.models.europython import EuroPythonSession, EuroPythonSpeaker, Schedule
 from src.models.pretalx import PretalxScheduleBreak, PretalxSpeaker, PretalxSubmission
-from src.utils.sort import Sort
+from src.utils.output_writer import OutputWriter
+from src.utils.serializer import Serializer
 
 
 class Utils:
@@ -167,20 +168,30 @@ class Utils:
         output_file: Path | str,
         data: dict[str, EuroPythonSession] | dict[str, EuroPythonSpeaker] | Schedule,
         direct_dump: bool = False,
-    ) -> None:
-        Path(output_file).parent.absolute().mkdir(parents=True, exist_ok=True)
+        writer: OutputWriter | None = None,
+    ) -> bool:
+        """
+        Writes the given data atomically, and with a writer, only if it changed
+        (see OutputWriter). Returns whether the file was written.
+        """
+        writer = writer or OutputWriter(Path(output_file).parent, skip_unchanged=False)
 
+        # Sorted and indented as they are written, see Serializer
         if not direct_dump:
-            with open(output_file, "w") as fd:
-                json.dump(
-                    Sort.sort_nested(
-                        {k: json.loads(v.model_dump_json()) for k, v in data.items()}
-                    ),
-                    fd,
-                    indent=2,
-                )
+            # The values are all of the same model
+            model = next((type(v) for v in data.values()), BaseModel)
+            return writer.write(
+                output_file,
+                lambda path: Serializer.write(
+                    path,
+                    {k: v.model_dump(mode="json") for k, v in data.items()},
+                    dict[str, model],
+                ),
+            )
         else:
-            with open(output_file, "w") as fd:
-                json.dump(
-                    Sort.sort_nested(json.loads(data.model_dump_json())), fd, indent=2
-                )
+            return writer.write(
+                output_file,
+                lambda path: Serializer.write(
+                    path, data.model_dump(mode="json"), type(data)
+                ),
+            )
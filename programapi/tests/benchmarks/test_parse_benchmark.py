@@ -0,0 +1,96 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from src.utils.parallel_parse import ParallelParse
+from src.utils.parse import Parse
+from src.utils.synthetic_event import SyntheticEvent
+from tests.benchmarks.utils import measure, report
+
+
+@pytest.fixture(scope="module")
+def raw_path(tmp_path_factory: pytest.TempPathFactory, benchmark_size: int) -> Path:
+    raw_path = tmp_path_factory.mktemp("raw")
+    SyntheticEvent(submissions=benchmark_size).dump(raw_path)
+
+    with open(raw_path / "submissions_latest.json") as fd:
+        records = json.load(fd)
+    with open(raw_path / "submissions_latest.jsonl", "w") as fd:
+        fd.write("".join(json.dumps(record) + "\n" for record in records))
+
+    return raw_path
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("prefilter", [False, True])
+def test_parse_submissions_and_speakers(raw_path: Path, prefilter: bool) -> None:
+    rows = {}
+    results = {}
+    for name, fast in [("model_validate", False), ("TypeAdapter", True)]:
+        submissions, *rows[f"submissions {name}"] = measure(
+            lambda: Parse.publishable_submissions(
+                raw_path / "submissions_latest.json", fast=fast, prefilter=prefilter
+            )
+        )
+        _, *rows[f"submissions JSONL {name}"] = measure(
+            lambda: Parse.publishable_submissions(
+                raw_path / "submissions_latest.jsonl", fast=fast, prefilter=prefilter
+            )
+        )
+        speakers, *rows[f"speakers {name}"] = measure(
+            lambda: Parse.publishable_speakers(
+                raw_path / "speakers_latest.json",
+                submissions.keys(),
+                fast=fast,
+                prefilter=prefilter,
+            )
+        )
+        results[name] = (submissions, speakers)
+
+    report(
+        "Parse.publishable_submissions / Parse.publishable_speakers" f" ({prefilter=})",
+        rows,
+    )
+    assert results["model_validate"] == results["TypeAdapter"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "submissions_name", ["submissions_latest.json", "submissions_latest.jsonl"]
+)
+def test_parallel_parse(
+    raw_path: Path, submissions_name: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    files = [
+        raw_path / submissions_name,
+        raw_path / "speakers_latest.json",
+        raw_path / "schedule_latest.json",
+    ]
+    cores = os.cpu_count() or 1
+    default_workers = ParallelParse().pool_workers(*files)
+
+    # The pool is forced, whatever the size of the files and the number of cores,
+    # to show how the parsing scales with the workers
+    worker_counts = sorted({1, 2, 4, cores})
+    monkeypatch.setattr(ParallelParse, "cores", max(worker_counts))
+    rows = {}
+    results = {}
+    for workers in worker_counts:
+        results[workers], *rows[f"{workers} workers"] = measure(
+            lambda: ParallelParse(
+                workers=workers, chunk_bytes=2**20, min_bytes=0
+            ).parse(*files),
+            trace_memory=False,
+        )
+
+    report(
+        f"ParallelParse.parse {submissions_name} ({cores} cores, "
+        f"{default_workers} workers by default)",
+        rows,
+    )
+    for workers in worker_counts[1:]:
+        speedup = rows["1 workers"][0] / rows[f"{workers} workers"][0]
+        print(f"  {workers} workers: {speedup:.2f}x the speed of 1 worker")
+    assert all(result == results[1] for result in results.values())
@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.transform import transform
+from src.utils.profiler import Profiler
+from src.utils.synthetic_event import SyntheticEvent
+from tests.benchmarks.utils import Baseline, report
+
+
+def profile_transform(
+    raw_path: Path, public_path: Path, cache_path: Path, memory: bool
+) -> Profiler:
+    """
+    Runs src/transform.py from scratch, without parse cache nor workers,
+    and returns the profiler of its stages
+    """
+    profiler = Profiler(memory=memory)
+    profiler.start()
+    try:
+        transform(raw_path, public_path, cache_path, parse_cache=False, parse_workers=1)
+    finally:
+        profiler.stop()
+    return profiler
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("submissions", [100, 1_000, 10_000, 50_000])
+def test_pipeline(
+    tmp_path_factory: pytest.TempPathFactory, baseline: Baseline, submissions: int
+) -> None:
+    raw_path = tmp_path_factory.mktemp("raw")
+    SyntheticEvent(submissions=submissions).dump(raw_path)
+
+    # Tracing the memory slows down the stages unevenly,
+    # so they are timed in a first run, and their memory measured in a second one
+    runs: dict[bool, Profiler] = {}
+    for memory in [False, True]:
+        runs[memory] = profile_transform(
+            raw_path,
+            tmp_path_factory.mktemp("public"),
+            tmp_path_factory.mktemp("cache"),
+            memory,
+        )
+
+    # The inner stages are part of the outer ones
+    rows: dict[str, tuple[float, Any]] = {
+        timed["name"]: (timed["wall_time"], traced["memory_peak"])
+        for timed, traced in zip(runs[False].stages, runs[True].stages)
+        if timed["depth"] == 0
+    }
+    rows["total"] = (
+        runs[False].wall_time,
+        max(stage["memory_peak"] for stage in runs[True].stages),
+    )
+    report(f"src/transform.py stages, {submissions} submissions", rows)
+
+    if slowdowns := baseline.check(f"pipeline[{submissions}]", rows):
+        pytest.fail("Slower than the baseline:\n" + "\n".join(slowdowns))
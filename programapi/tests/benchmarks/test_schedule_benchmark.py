@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+from src.utils.parse import Parse
+from src.utils.synthetic_event import SyntheticEvent
+from tests.benchmarks.utils import measure, report
+
+
+@pytest.fixture(scope="module")
+def raw_path(tmp_path_factory: pytest.TempPathFactory, benchmark_size: int) -> Path:
+    raw_path = tmp_path_factory.mktemp("raw")
+    SyntheticEvent(submissions=benchmark_size).dump(raw_path)
+    return raw_path
+
+
+@pytest.mark.benchmark
+def test_parse_schedule(raw_path: Path) -> None:
+    rows = {}
+    schedule, *rows["eager"] = measure(
+        lambda: Parse.schedule(raw_path / "schedule_latest.json")
+    )
+    lazy_schedule, *rows["lazy (breaks only)"] = measure(
+        lambda: Parse.schedule(raw_path / "schedule_latest.json", lazy=True)
+    )
+    _, *rows["lazy, then slots accessed"] = measure(lambda: lazy_schedule.slots)
+
+    report("Parse.schedule", rows)
+    assert lazy_schedule.breaks == schedule.breaks
+    assert lazy_schedule.slots == schedule.slots
@@ -0,0 +1,129 @@
+import pytest
+
+from src.utils.session_index import IntervalIndex, Timeline
+from src.utils.timing_relationships import TimingRelationships
+from tests.benchmarks.utils import measure, report, scheduled_sessions
+from tests.test_timing_relationships import Reference
+
+
+@pytest.mark.benchmark
+def test_sessions_after_and_before() -> None:
+    rows = {}
+    for count in [1_000, 10_000, 50_000]:
+        sessions = scheduled_sessions(count)
+
+        def indexed() -> list[tuple[list[str], list[str]]]:
+            interval_index = IntervalIndex(sessions)
+            timeline = Timeline(sessions)
+            result = []
+            for session in sessions:
+                parallel = TimingRelationships.compute_sessions_in_parallel(
+                    session, sessions, interval_index
+                )
+                result.append(
+                    (
+                        TimingRelationships.compute_sessions_after(
+                            session, sessions, parallel, timeline
+                        ),
+                        TimingRelationships.compute_sessions_before(
+                            session, sessions, parallel, timeline
+                        ),
+                    )
+                )
+            return result
+
+        result, *rows[f"{count} sessions, indexed"] = measure(
+            indexed, trace_memory=False
+        )
+
+        if count <= 1_000:
+
+            def reference() -> list[tuple[list[str], list[str]]]:
+                result = []
+                for session in sessions:
+                    parallel = Reference.sessions_in_parallel(session, sessions)
+                    result.append(
+                        (
+                            Reference.sessions_after(session, sessions, parallel),
+                            Reference.sessions_before(session, sessions, parallel),
+                        )
+                    )
+                return result
+
+            expected, *rows[f"{count} sessions, brute force"] = measure(
+                reference, trace_memory=False
+            )
+            assert result == expected
+
+    report("Sessions in parallel, after and before", rows)
+
+
+@pytest.mark.benchmark
+def test_prev_or_next_session() -> None:
+    sessions = scheduled_sessions(10_000)
+    timeline = Timeline(sessions)
+    sessions_after = [
+        TimingRelationships.compute_sessions_after(session, sessions, [], timeline)
+        for session in sessions
+    ]
+
+    def indexed() -> list[str | None]:
+        sessions_by_code = TimingRelationships.index_by_code(sessions)
+        return [
+            TimingRelationships.compute_prev_or_next_session(
+                session, after, sessions, sessions_by_code
+            )
+            for session, after in zip(sessions, sessions_after)
+        ]
+
+    def scan() -> list[str | None]:
+        return [
+            Reference.prev_or_next_session(session, after, sessions)
+            for session, after in zip(sessions[:500], sessions_after)
+        ]
+
+    rows = {}
+    result, *rows["indexed, 10000 sessions"] = measure(indexed, trace_memory=False)
+    expected, *rows["scan, the first 500 of them"] = measure(scan, trace_memory=False)
+
+    report("TimingRelationships.compute_prev_or_next_session", rows)
+    assert result[:500] == expected
+
+
+@pytest.mark.benchmark
+def test_compute() -> None:
+    pytest.importorskip("numpy")
+    rows = {}
+    for count in [1_000, 10_000, 50_000]:
+        sessions = scheduled_sessions(count)
+        for backend in ["python", "numpy"]:
+            _, *rows[f"{count} sessions, {backend}"] = measure(
+                lambda: TimingRelationships.compute(sessions, backend=backend),
+                trace_memory=False,
+            )
+
+    report("TimingRelationships.compute", rows)
+
+
+@pytest.mark.benchmark
+def test_update() -> None:
+    sessions = scheduled_sessions(10_000)
+    relationships = TimingRelationships.compute(sessions)
+
+    # Swap two talks of the same room
+    first, second = sessions[101], sessions[102]
+    sessions[101] = first.model_copy(update={"code": second.code})
+    sessions[102] = second.model_copy(update={"code": first.code})
+
+    rows = {}
+    _, *rows["update, 2 changed sessions"] = measure(
+        lambda: relationships.update(sessions, {first.code, second.code}),
+        trace_memory=False,
+    )
+    expected, *rows["compute, 10000 sessions"] = measure(
+        lambda: TimingRelationships.compute(sessions, backend="python"),
+        trace_memory=False,
+    )
+
+    report("TimingRelationships.update", rows)
+    assert relationships.all_sessions_after == expected.all_sessions_after
@@ -0,0 +1,128 @@
+import json
+import random
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from src.models.pretalx import PretalxSubmission
+
+
+def measure(
+    func: Callable[[], Any], trace_memory: bool = True
+) -> tuple[Any, float, int | None]:
+    """
+    Runs the given function once, returns its result,
+    the wall time in seconds and the peak of the traced memory in bytes.
+
+    Tracing the memory slows down code that allocates a lot of small objects,
+    without ``trace_memory`` only the wall time is measured.
+    """
+    if not trace_memory:
+        started = time.perf_counter()
+        result = func()
+        return result, time.perf_counter() - started, None
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+        wall_time = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, wall_time, peak
+
+
+def report(title: str, rows: dict[str, tuple[float, int | None]]) -> None:
+    print(f"\n{title}")
+    width = max(32, *map(len, rows))
+    for name, (wall_time, peak) in rows.items():
+        memory = f"{peak / 2**20:10.1f} MiB peak" if peak is not None else ""
+        print(f"  {name:<{width}} {wall_time:8.3f}s {memory}".rstrip())
+
+
+class Baseline:
+    """
+    The wall times of the stages of the benchmarks of a previous run, stored in
+    a JSON file, to flag the stages that got more than ``threshold`` times slower.
+
+    Stages faster than ``min_wall_time`` seconds are too noisy to be compared.
+    """
+
+    min_wall_time = 0.05
+
+    def __init__(self, path: Path, threshold: float) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.timings: dict[str, dict[str, float]] = {}
+        if path.exists():
+            self.timings = json.loads(path.read_text())
+        self.current: dict[str, dict[str, float]] = {}
+
+    def check(self, name: str, rows: dict[str, tuple[float, int | None]]) -> list[str]:
+        """
+        Records the wall times of the stages of a benchmark,
+        and returns the slowdowns compared to the baseline
+        """
+        self.current[name] = {
+            stage: wall_time for stage, (wall_time, _) in rows.items()
+        }
+
+        slowdowns = []
+        for stage, wall_time in self.current[name].items():
+            baseline = self.timings.get(name, {}).get(stage)
+            if (
+                baseline
+                and wall_time > self.min_wall_time
+                and wall_time > baseline * self.threshold
+            ):
+                slowdowns.append(
+                    f"{name} {stage}: {wall_time:.3f}s against {baseline:.3f}s"
+                    f" ({wall_time / baseline:.1f}x)"
+                )
+        return slowdowns
+
+    def save(self) -> None:
+        self.path.write_text(
+            json.dumps(self.timings | self.current, indent=2, sort_keys=True) + "\n"
+        )
+
+
+def scheduled_sessions(count: int, rooms: int = 20) -> list[PretalxSubmission]:
+    """
+    Returns ``count`` sessions back to back in ``rooms`` rooms, from 9:00 to 18:00,
+    over as many days as needed, opening each day with a keynote
+    """
+    rng = random.Random(0)
+    first_day = datetime(2099, 7, 1, 9, tzinfo=timezone.utc)
+    sessions = []
+    day = room = 0
+    start = first_day
+    while len(sessions) < count:
+        minutes = rng.choice([30, 30, 45, 45, 60, 180])
+        if start + timedelta(minutes=minutes) > first_day + timedelta(
+            days=day, hours=9
+        ):
+            room += 1
+            if room == rooms:
+                day, room = day + 1, 0
+            start = first_day + timedelta(days=day, minutes=0 if room == 0 else 45)
+            continue
+
+        keynote = room == 0 and start == first_day + timedelta(days=day)
+        sessions.append(
+            PretalxSubmission.model_construct(
+                code=f"S{len(sessions):06}",
+                submission_type="Keynote" if keynote else "Talk",
+                room=f"Room {room}",
+                start=start,
+                end=start + timedelta(minutes=minutes),
+            )
+        )
+        start += timedelta(minutes=minutes + 15)
+
+    return sessions
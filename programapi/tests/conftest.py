@@ -0,0 +1,143 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from src.models.europython import EuroPythonSession, EuroPythonSpeaker, Schedule
+from src.models.pretalx import PretalxSchedule, PretalxSpeaker, PretalxSubmission
+from src.utils.output_writer import OutputWriter
+from src.utils.parse import Parse
+from src.utils.synthetic_event import SyntheticEvent
+from src.utils.timing_relationships import TimingRelationships
+from src.utils.transform import Transform
+from src.utils.utils import Utils
+from tests.benchmarks.utils import Baseline
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run the benchmarks in tests/benchmarks",
+    )
+    parser.addoption(
+        "--benchmark-size",
+        type=int,
+        default=5000,
+        help="Number of submissions of the synthetic events used in the benchmarks",
+    )
+    parser.addoption(
+        "--benchmark-baseline",
+        type=Path,
+        default=Path(__file__).parent / "benchmarks" / "baseline.json",
+        help="File of the baseline timings the benchmarks are compared to",
+    )
+    parser.addoption(
+        "--benchmark-save",
+        action="store_true",
+        default=False,
+        help="Store the timings of this run as the baseline",
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=1.3,
+        help="Fail the benchmarks with stages slower than this times their baseline",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "benchmark: slow performance measurements")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if config.getoption("--run-benchmarks"):
+        return
+
+    skip = pytest.mark.skip(reason="Needs --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def benchmark_size(request: pytest.FixtureRequest) -> int:
+    return request.config.getoption("--benchmark-size")
+
+
+@pytest.fixture(scope="session")
+def baseline(request: pytest.FixtureRequest) -> Iterator[Baseline]:
+    baseline = Baseline(
+        request.config.getoption("--benchmark-baseline"),
+        request.config.getoption("--benchmark-threshold"),
+    )
+    yield baseline
+    if request.config.getoption("--benchmark-save"):
+        baseline.save()
+
+
+@dataclass
+class TransformedEvent:
+    """
+    A synthetic event taken through src/transform.py: its raw files, the parsed
+    and transformed objects, and the public directory with sessions.json,
+    speakers.json and schedule.json.
+
+    It is shared by the tests, which must not change it: the ones writing more
+    files work on a copy of the public directory.
+    """
+
+    event: SyntheticEvent
+    raw_path: Path
+    public_path: Path
+    submissions: dict[str, PretalxSubmission]
+    speakers: dict[str, PretalxSpeaker]
+    schedule: PretalxSchedule
+    ep_sessions: dict[str, EuroPythonSession]
+    ep_speakers: dict[str, EuroPythonSpeaker]
+    ep_schedule: Schedule
+
+
+@pytest.fixture(scope="session")
+def transformed_event(tmp_path_factory: pytest.TempPathFactory) -> TransformedEvent:
+    event = SyntheticEvent(submissions=300, answers=2, workshop_ratio=0.1, seed=42)
+    raw_path = tmp_path_factory.mktemp("raw")
+    public_path = tmp_path_factory.mktemp("public")
+    event.dump(raw_path)
+
+    submissions = Parse.publishable_submissions(raw_path / "submissions_latest.json")
+    speakers = Parse.publishable_speakers(
+        raw_path / "speakers_latest.json", submissions.keys()
+    )
+    schedule = Parse.schedule(raw_path / "schedule_latest.json")
+    ep_sessions = Transform.pretalx_submissions_to_europython_sessions(
+        submissions, TimingRelationships.compute(submissions.values())
+    )
+    ep_speakers = Transform.pretalx_speakers_to_europython_speakers(speakers)
+    ep_schedule = Transform.pretalx_schedule_to_europython_schedule(
+        schedule.breaks, ep_sessions, ep_speakers
+    )
+
+    writer = OutputWriter(public_path)
+    Utils.write_to_file(public_path / "sessions.json", ep_sessions, writer=writer)
+    Utils.write_to_file(public_path / "speakers.json", ep_speakers, writer=writer)
+    Utils.write_to_file(
+        public_path / "schedule.json", ep_schedule, direct_dump=True, writer=writer
+    )
+    writer.save_manifest()
+
+    return TransformedEvent(
+        event,
+        raw_path,
+        public_path,
+        submissions,
+        speakers,
+        schedule,
+        ep_sessions,
+        ep_speakers,
+        ep_schedule,
+    )
@@ -0,0 +1,86 @@
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.transform import transform
+from src.utils.compression import Compression
+from tests.conftest import TransformedEvent
+
+
+def write_files(output_dir: Path) -> None:
+    (output_dir / "sessions").mkdir(parents=True)
+    (output_dir / "schedule.json").write_text('{"days": {}}\n' * 100)
+    (output_dir / "speakers.json").write_text('{"speakers": {}}\n' * 100)
+    (output_dir / "sessions" / "ABC.json").write_text('{"code": "ABC"}')
+    (output_dir / "notes.txt").write_text("Not JSON")
+
+
+def test_compress_files(tmp_path: Path) -> None:
+    write_files(tmp_path)
+    report = Compression(workers=2, min_bytes=0).compress_files(
+        tmp_path, ["schedule.json", "sessions/ABC.json", "notes.txt"]
+    )
+
+    assert sorted(report) == ["schedule.json", "sessions/ABC.json"]
+    for name, row in report.items():
+        data = (tmp_path / name).read_bytes()
+        assert gzip.decompress((tmp_path / f"{name}.gz").read_bytes()) == data
+        assert row["size"] == len(data)
+        assert row["gz"] == (tmp_path / f"{name}.gz").stat().st_size
+        assert row["gz_ratio"] == round(row["size"] / row["gz"], 2)
+    assert report["schedule.json"]["gz_ratio"] > 10
+    # Only the given files are compressed
+    assert not (tmp_path / "speakers.json.gz").exists()
+    assert not (tmp_path / "notes.txt.gz").exists()
+
+
+def test_compress_files_skips_small_files(tmp_path: Path) -> None:
+    write_files(tmp_path)
+    compression = Compression(min_bytes=100)
+    names = ["schedule.json", "sessions/ABC.json"]
+    assert list(compression.compress_files(tmp_path, names)) == ["schedule.json"]
+    assert not (tmp_path / "sessions" / "ABC.json.gz").exists()
+
+    # The copy of a file that got smaller is removed
+    (tmp_path / "schedule.json").write_text("{}")
+    assert compression.compress_files(tmp_path, names) == {}
+    assert not (tmp_path / "schedule.json.gz").exists()
+
+
+def test_compression_after_a_stopped_run(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    transformed_event: TransformedEvent,
+) -> None:
+    raw_path, public_path, cache_path = (
+        tmp_path / "raw",
+        tmp_path / "public",
+        tmp_path / "cache",
+    )
+    shutil.copytree(transformed_event.raw_path, raw_path)
+    transform(raw_path, public_path, cache_path, parse_workers=1)
+
+    submissions_file = raw_path / "submissions_latest.json"
+    submissions = json.loads(submissions_file.read_text())
+    for submission in submissions:
+        submission["title"] += " (updated)"
+    submissions_file.write_text(json.dumps(submissions))
+
+    # The files are written, but the run stops before compressing them
+    def compress_files(*args: object) -> None:
+        raise RuntimeError("Stopped")
+
+    with monkeypatch.context() as context:
+        context.setattr(Compression, "compress_files", compress_files)
+        with pytest.raises(RuntimeError):
+            transform(raw_path, public_path, cache_path, parse_workers=1)
+
+    # The next run compresses them
+    transform(raw_path, public_path, cache_path, parse_workers=1)
+    compressed = list(public_path.rglob("*.json.gz"))
+    assert any(path.parent.name == "schedule" for path in compressed)
+    for path in compressed:
+        assert gzip.decompress(path.read_bytes()) == path.with_suffix("").read_bytes()
@@ -0,0 +1,157 @@
+import json
+import random
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.utils.delta_feed import DeltaFeed
+from src.utils.output_writer import OutputWriter
+
+
+@pytest.mark.parametrize(
+    ("source", "target"),
+    [
+        ({"a": 1, "b": [1, 2]}, {"a": 1, "b": [1, 2]}),
+        ({"a": 1, "b": 2}, {"b": 3, "c": {"d": None}}),
+        ([1, 2, 3, 4, 5], [1, 2, 9, 4, 5]),
+        ([1, 2, 3, 4, 5], [1, 2, 2.5, 3, 4, 5]),
+        ([1, 2, 3, 4, 5], [1, 5]),
+        ([1, 1, 1], [1, 1]),
+        ([{"code": "A", "rooms": ["x"]}], [{"code": "A", "rooms": ["y", "x"]}]),
+        ({"a/b": 1, "c~d": 2}, {"a/b": 3}),
+        ({"a": 1}, {"a": "1"}),
+        ({"a": [1]}, {"a": {"0": 1}}),
+        ([1, 2], []),
+        ({}, {"x": []}),
+    ],
+)
+def test_diff_apply(source: Any, target: Any) -> None:
+    operations = DeltaFeed.diff(source, target)
+    result = DeltaFeed.apply(source, operations)
+    assert result == target
+    assert json.dumps(result) == json.dumps(target)
+    assert (source == target) == (not operations)
+
+
+def test_diff_apply_random() -> None:
+    rng = random.Random(7)
+
+    def mutate(document: dict[str, Any]) -> dict[str, Any]:
+        document = json.loads(json.dumps(document))
+        for _ in range(rng.randint(1, 5)):
+            code = rng.choice(sorted(document))
+            if rng.random() < 0.2:
+                del document[code]
+            else:
+                session = document[code]
+                session["title"] = f"Talk {rng.randint(0, 100)}"
+                if session["rooms"] and rng.random() < 0.5:
+                    session["rooms"].pop(rng.randrange(len(session["rooms"])))
+                else:
+                    session["rooms"].insert(0, f"Room {rng.randint(0, 5)}")
+        document[f"S{rng.randint(0, 10**6)}"] = {"title": "New", "rooms": []}
+        return document
+
+    document = {
+        f"S{i}": {"title": f"Talk {i}", "rooms": [f"Room {i % 3}"]} for i in range(30)
+    }
+    for _ in range(50):
+        target = mutate(document)
+        assert DeltaFeed.apply(document, DeltaFeed.diff(document, target)) == target
+        document = target
+
+
+def write_files(output_dir: Path, document: dict[str, Any]) -> OutputWriter:
+    writer = OutputWriter(output_dir)
+    for key, name in DeltaFeed.files.items():
+        writer.write_text(output_dir / name, json.dumps(document[key], indent=2))
+    return writer
+
+
+def test_publish(tmp_path: Path) -> None:
+    output_dir = tmp_path / "public"
+    feed = DeltaFeed(output_dir, tmp_path / "cache", size=3)
+    documents = [
+        {
+            "sessions": {"A": {"title": f"Talk {i}", "room": "x"}},
+            "speakers": {"B": {"name": "Ada"}},
+            "schedule": {"days": {"2024-12-07": {"events": list(range(i))}}},
+        }
+        for i in range(6)
+    ]
+
+    # The first version has no patch, nothing to patch from
+    assert feed.publish(write_files(output_dir, documents[0])) == 1
+    assert feed.load_index()["patches"] == []
+
+    for version, document in enumerate(documents[1:], start=2):
+        assert feed.publish(write_files(output_dir, document)) == version
+
+    # Unchanged files do not make a version
+    assert feed.publish(write_files(output_dir, documents[-1])) == 6
+
+    index = feed.load_index()
+    assert index["version"] == 6
+    assert [(patch["from"], patch["to"]) for patch in index["patches"]] == [
+        (3, 4),
+        (4, 5),
+        (5, 6),
+    ]
+    assert sorted(path.name for path in (output_dir / "patches").iterdir()) == [
+        "4.json",
+        "5.json",
+        "6.json",
+        "index.json",
+    ]
+
+    # A client holding version 3 catches up with the patches
+    document = documents[2]
+    for patch in index["patches"]:
+        operations = json.loads((output_dir / patch["path"]).read_text())
+        assert len(operations) == patch["operations"]
+        document = DeltaFeed.apply(document, operations)
+    assert document == documents[-1]
+
+
+def test_publish_after_a_stopped_run(tmp_path: Path) -> None:
+    output_dir = tmp_path / "public"
+    feed = DeltaFeed(output_dir, tmp_path / "cache")
+    document = {"sessions": {}, "speakers": {}, "schedule": {"days": {}}}
+    assert feed.publish(write_files(output_dir, document)) == 1
+
+    # The files are replaced, but the run stops before publishing them:
+    # the next run finds them unchanged, and still publishes the patch
+    changed = dict(document, sessions={"A": {"title": "Talk"}})
+    write_files(output_dir, changed)
+    assert feed.publish(write_files(output_dir, changed)) == 2
+    (patch,) = feed.load_index()["patches"]
+    operations = json.loads((output_dir / patch["path"]).read_text())
+    assert DeltaFeed.apply(document, operations) == changed
+
+
+def test_publish_after_losing_the_output(tmp_path: Path) -> None:
+    output_dir, cache_dir = tmp_path / "public", tmp_path / "cache"
+    feed = DeltaFeed(output_dir, cache_dir)
+    document = {"sessions": {}, "speakers": {}, "schedule": {"days": {}}}
+    assert feed.publish(write_files(output_dir, document)) == 1
+    document["sessions"]["A"] = {"title": "Talk"}
+    assert feed.publish(write_files(output_dir, document)) == 2
+    assert feed.load_index()["reset"] == 1
+
+    # The versions go on from the one kept in the cache directory,
+    # so the clients holding version 2 see that they need to fetch the files again
+    shutil.rmtree(output_dir)
+    assert feed.publish(write_files(output_dir, document)) == 3
+    assert feed.load_index() == {"version": 3, "reset": 3, "patches": []}
+    assert feed.load_state()["version"] == 3
+
+    # Without the cache, nothing to patch from either
+    shutil.rmtree(cache_dir)
+    document["sessions"]["B"] = {"title": "Talk"}
+    assert feed.publish(write_files(output_dir, document)) == 4
+    assert feed.load_index() == {"version": 4, "reset": 4, "patches": []}
+    assert list((output_dir / "patches").iterdir()) == [
+        output_dir / "patches/index.json"
+    ]
@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from src.config import Config
+from src.utils.download import Download
+from src.utils.http_cache import HttpCache
+
+BASE_URL = "https://pretalx.example/api/events/test/"
+RESOURCE = "submissions?questions=all"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body: bytes, etag: str | None) -> None:
+        self.status_code = status_code
+        self.content = body
+        self.text = body.decode()
+        self.headers = {"ETag": etag} if etag else {}
+
+
+class FakeSession:
+    """
+    Serves ``count`` records with Pretalx-like limit/offset pagination and ETags
+    """
+
+    def __init__(self, count: int, limit: int) -> None:
+        self.records = [{"code": f"S{i:04}"} for i in range(count)]
+        self.limit = limit
+        self.requested: list[str] = []
+        self.not_modified = 0
+
+    def get(self, url: str, headers: dict[str, str]) -> FakeResponse:
+        self.requested.append(url)
+        query = parse_qs(urlsplit(url).query)
+        offset = int(query.get("offset", ["0"])[0])
+        end = offset + self.limit
+        next_url = None
+        if end < len(self.records):
+            next_url = f"{BASE_URL}{RESOURCE}&limit={self.limit}&offset={end}"
+        body = json.dumps(
+            {
+                "count": len(self.records),
+                "next": next_url,
+                "results": self.records[offset:end],
+            }
+        ).encode()
+
+        etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        if headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return FakeResponse(304, b"", etag)
+        return FakeResponse(200, body, etag)
+
+    def __enter__(self) -> "FakeSession":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+def test_page_url_keeps_other_parameters() -> None:
+    url = Download.page_url(f"{BASE_URL}{RESOURCE}&limit=25&offset=25", 75)
+    assert parse_qs(urlsplit(url).query) == {
+        "questions": ["all"],
+        "limit": ["25"],
+        "offset": ["75"],
+    }
+
+
+def test_name() -> None:
+    assert Download.name("submissions?questions=all") == "submissions"
+    assert Download.name("p/youtube") == "youtube"
+    assert Download.name("schedules/latest/") == "latest"
+
+
+def test_paginated_keeps_order() -> None:
+    session = FakeSession(count=103, limit=10)
+    download = Download(BASE_URL, concurrency=4, session=session, headers={})
+
+    results = asyncio.run(download.paginated(RESOURCE))
+
+    assert results == session.records
+    assert len(session.requested) == 11
+
+
+def test_paginated_single_page() -> None:
+    session = FakeSession(count=3, limit=10)
+    download = Download(BASE_URL, concurrency=4, session=session, headers={})
+
+    results = asyncio.run(download.paginated(RESOURCE))
+
+    assert results == session.records
+    assert len(session.requested) == 1
+
+
+def test_unchanged_pages_are_served_from_cache(tmp_path) -> None:
+    session = FakeSession(count=25, limit=10)
+    cache = HttpCache(tmp_path)
+
+    first = Download(BASE_URL, session=session, headers={}, cache=cache)
+    assert asyncio.run(first.paginated(RESOURCE)) == session.records
+    assert first.changes == {"submissions": True}
+
+    second = Download(BASE_URL, session=session, headers={}, cache=cache)
+    assert asyncio.run(second.paginated(RESOURCE)) == session.records
+    assert second.changes == {"submissions": False}
+    assert session.not_modified == 3
+
+    session.records[-1]["title"] = "Changed"
+    third = Download(BASE_URL, session=session, headers={}, cache=cache)
+    assert asyncio.run(third.paginated(RESOURCE)) == session.records
+    assert third.changes == {"submissions": True}
+
+
+def test_stream_to_jsonl(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(Config, "raw_path", tmp_path)
+    session = FakeSession(count=47, limit=10)
+    download = Download(
+        BASE_URL, concurrency=2, session=session, headers={}, stream=True
+    )
+
+    asyncio.run(download.stream_to_file(RESOURCE))
+
+    with open(tmp_path / "submissions_latest.jsonl") as fd:
+        assert [json.loads(line) for line in fd] == session.records
+    assert not (tmp_path / "submissions_latest.jsonl.part").exists()
+
+
+def test_stream_resumes_after_crash(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(Config, "raw_path", tmp_path)
+    session = FakeSession(count=47, limit=10)
+
+    # A previous run crashed while writing the 13th record
+    with open(tmp_path / "submissions_latest.jsonl.part", "w") as fd:
+        fd.write("".join(json.dumps(r) + "\n" for r in session.records[:12]))
+        fd.write('{"code": "S00')
+
+    download = Download(
+        BASE_URL, concurrency=2, session=session, headers={}, stream=True
+    )
+    asyncio.run(download.stream_to_file(RESOURCE))
+
+    with open(tmp_path / "submissions_latest.jsonl") as fd:
+        assert [json.loads(line) for line in fd] == session.records
+    assert "offset=12" in session.requested[0]
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils.output_writer import OutputWriter
+
+
+def write_text(text: str):
+    return lambda path: path.write_text(text)
+
+
+def test_unchanged_files_are_not_written(tmp_path: Path) -> None:
+    writer = OutputWriter(tmp_path)
+    assert writer.write(tmp_path / "sessions.json", write_text("[1]"))
+    assert writer.write(tmp_path / "schedule" / "day.json", write_text("{}"))
+    assert writer.save_manifest()
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["files"].keys() == {"sessions.json", "schedule/day.json"}
+    assert manifest["files"]["sessions.json"]["size"] == 3
+    mtime = (tmp_path / "sessions.json").stat().st_mtime_ns
+    manifest_mtime = (tmp_path / "manifest.json").stat().st_mtime_ns
+
+    writer = OutputWriter(tmp_path)
+    assert not writer.write(tmp_path / "sessions.json", write_text("[1]"))
+    assert not writer.save_manifest()
+    assert writer.unchanged == ["sessions.json"]
+    assert (tmp_path / "sessions.json").stat().st_mtime_ns == mtime
+    assert (tmp_path / "manifest.json").stat().st_mtime_ns == manifest_mtime
+
+    writer = OutputWriter(tmp_path)
+    assert writer.write(tmp_path / "sessions.json", write_text("[2]"))
+    assert writer.save_manifest()
+    assert (tmp_path / "sessions.json").read_text() == "[2]"
+    assert json.loads((tmp_path / "manifest.json").read_text()) != manifest
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+
+def test_files_written_before_the_manifest(tmp_path: Path) -> None:
+    (tmp_path / "speakers.json").write_text("{}")
+    (tmp_path / "sessions.json").write_text("{}")
+
+    writer = OutputWriter(tmp_path)
+    assert not writer.write(tmp_path / "speakers.json", write_text("{}"))
+    assert writer.write(tmp_path / "sessions.json", write_text("[]"))
+    assert writer.save_manifest()
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["files"].keys() == {"speakers.json", "sessions.json"}
+
+
+def test_failed_writes_keep_the_previous_file(tmp_path: Path) -> None:
+    (tmp_path / "sessions.json").write_text("[1]")
+
+    def fail(path: Path) -> None:
+        path.write_text("[")
+        raise ValueError
+
+    for writer in [
+        OutputWriter(tmp_path),
+        OutputWriter(tmp_path, skip_unchanged=False),
+    ]:
+        with pytest.raises(ValueError):
+            writer.write(tmp_path / "sessions.json", fail)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["sessions.json"]
+    assert (tmp_path / "sessions.json").read_text() == "[1]"
+
+
+def test_up_to_date(tmp_path: Path) -> None:
+    inputs = {"submissions": "a", "code": "b"}
+    # Nothing written yet
+    assert not OutputWriter(tmp_path).up_to_date(inputs)
+
+    writer = OutputWriter(tmp_path)
+    writer.write(tmp_path / "sessions.json", write_text("[1]"))
+    writer.write(tmp_path / "schedule" / "day.json", write_text("{}"))
+    # The inputs are only recorded once all the files are written
+    writer.save_manifest()
+    assert not OutputWriter(tmp_path).up_to_date(inputs)
+
+    writer.set_inputs(inputs)
+    assert writer.save_manifest()
+    assert OutputWriter(tmp_path).up_to_date(inputs)
+    assert not OutputWriter(tmp_path).up_to_date(inputs | {"submissions": "c"})
+
+    # The inputs are kept by the runs that do not change them
+    writer = OutputWriter(tmp_path)
+    writer.write(tmp_path / "sessions.json", write_text("[2]"))
+    writer.save_manifest()
+    assert OutputWriter(tmp_path).up_to_date(inputs)
+
+    (tmp_path / "schedule" / "day.json").unlink()
+    assert not OutputWriter(tmp_path).up_to_date(inputs)
@@ -0,0 +1,104 @@
+import pytest
+
+from src.models.pretalx import PretalxLazySchedule, PretalxSchedule
+from src.utils.parallel_parse import ParallelParse
+from src.utils.parse import Parse
+from src.utils.parse_cache import ParseCache
+from src.utils.synthetic_event import SyntheticEvent
+from tests.test_parse import to_jsonl
+
+
+@pytest.fixture(scope="module")
+def raw_path(tmp_path_factory):
+    raw_path = tmp_path_factory.mktemp("raw")
+    SyntheticEvent(submissions=200, answers=2, seed=5).dump(raw_path)
+    to_jsonl(raw_path / "submissions_latest.json", raw_path / "submissions.jsonl")
+    return raw_path
+
+
+@pytest.mark.parametrize(
+    "submissions_name", ["submissions_latest.json", "submissions.jsonl"]
+)
+@pytest.mark.parametrize("workers, chunk_bytes", [(1, 8 * 2**20), (3, 20_000)])
+@pytest.mark.parametrize("fast", [False, True])
+def test_parallel_parse_is_identical_to_sequential(
+    raw_path, submissions_name, workers, chunk_bytes, fast, monkeypatch
+) -> None:
+    # Parse the small files in a process pool, even on a single core
+    monkeypatch.setattr(ParallelParse, "cores", 4)
+    submissions = Parse.publishable_submissions(raw_path / submissions_name)
+    speakers = Parse.publishable_speakers(
+        raw_path / "speakers_latest.json", submissions.keys()
+    )
+    schedule = Parse.schedule(raw_path / "schedule_latest.json")
+
+    result = ParallelParse(
+        workers=workers, chunk_bytes=chunk_bytes, min_bytes=0, fast=fast
+    ).parse(
+        raw_path / submissions_name,
+        raw_path / "speakers_latest.json",
+        raw_path / "schedule_latest.json",
+    )
+
+    assert result == (submissions, speakers, schedule)
+    assert list(result[0]) == list(submissions)
+    assert list(result[1]) == list(speakers)
+
+
+def test_split(raw_path, tmp_path) -> None:
+    chunks = ParallelParse.split(raw_path / "submissions.jsonl", 20_000, tmp_path)
+
+    assert len(chunks) > 2
+    assert [r for c in chunks for r in Parse.records(c)] == list(
+        Parse.records(raw_path / "submissions.jsonl")
+    )
+    assert ParallelParse.split(raw_path / "submissions.jsonl", None, tmp_path) == [
+        raw_path / "submissions.jsonl"
+    ]
+    # JSON files are not split
+    assert ParallelParse.split(
+        raw_path / "submissions_latest.json", 20_000, tmp_path
+    ) == [raw_path / "submissions_latest.json"]
+
+
+def test_pool_workers(raw_path, monkeypatch) -> None:
+    files = [raw_path / "submissions.jsonl", raw_path / "speakers_latest.json"]
+    size = sum(path.stat().st_size for path in files)
+    monkeypatch.setattr(ParallelParse, "cores", 4)
+
+    assert ParallelParse(workers=8, min_bytes=size).pool_workers(*files) == 4
+    assert ParallelParse(workers=2, min_bytes=size).pool_workers(*files) == 2
+    # Small files
+    assert ParallelParse(workers=8, min_bytes=size + 1).pool_workers(*files) == 1
+    # A single core
+    monkeypatch.setattr(ParallelParse, "cores", 1)
+    assert ParallelParse(workers=8, min_bytes=0).pool_workers(*files) == 1
+
+
+def test_parallel_parse_uses_the_cache(raw_path, tmp_path) -> None:
+    files = [
+        raw_path / "submissions_latest.json",
+        raw_path / "speakers_latest.json",
+        raw_path / "schedule_latest.json",
+    ]
+    cache = ParseCache(tmp_path)
+    first = ParallelParse(workers=2, cache=cache).parse(*files)
+    second = ParallelParse(workers=2, cache=cache).parse(*files)
+
+    assert cache.hits == ["schedule", "submissions", "speakers"]
+    assert first == second
+
+
+def test_parallel_parse_caches_the_lazy_schedule_apart(raw_path, tmp_path) -> None:
+    files = [
+        raw_path / "submissions_latest.json",
+        raw_path / "speakers_latest.json",
+        raw_path / "schedule_latest.json",
+    ]
+    cache = ParseCache(tmp_path)
+    lazy = ParallelParse(workers=1, lazy_schedule=True, cache=cache).parse(*files)[2]
+    eager = ParallelParse(workers=1, cache=cache).parse(*files)[2]
+
+    assert cache.hits == ["submissions", "speakers"]
+    assert isinstance(lazy, PretalxLazySchedule)
+    assert isinstance(eager, PretalxSchedule)
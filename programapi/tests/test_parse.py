@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+from src.utils.parse import Parse
+from src.utils.projection import Projection
+from src.utils.synthetic_event import SyntheticEvent
+
+EXAMPLES = Path("./data/examples/pretalx")
+
+
+def to_jsonl(input_file: Path, output_file: Path) -> Path:
+    with open(input_file) as fd:
+        records = json.load(fd)
+    with open(output_file, "w") as fd:
+        fd.write("".join(json.dumps(record) + "\n" for record in records))
+    return output_file
+
+
+def test_jsonl_submissions_and_speakers(tmp_path) -> None:
+    submissions = Parse.publishable_submissions(EXAMPLES / "submissions.json")
+    speakers = Parse.publishable_speakers(
+        EXAMPLES / "speakers.json", submissions.keys()
+    )
+
+    jsonl_submissions = Parse.publishable_submissions(
+        to_jsonl(EXAMPLES / "submissions.json", tmp_path / "submissions.jsonl")
+    )
+    jsonl_speakers = Parse.publishable_speakers(
+        to_jsonl(EXAMPLES / "speakers.json", tmp_path / "speakers.jsonl"),
+        jsonl_submissions.keys(),
+    )
+
+    assert jsonl_submissions == submissions
+    assert jsonl_speakers == speakers
+
+
+def test_raw_file_prefers_latest_download(tmp_path) -> None:
+    assert Parse.raw_file(tmp_path, "speakers") == tmp_path / "speakers_latest.json"
+
+    (tmp_path / "speakers_latest.jsonl").write_text("")
+    assert Parse.raw_file(tmp_path, "speakers") == tmp_path / "speakers_latest.jsonl"
+
+
+def test_fast_parse(tmp_path) -> None:
+    SyntheticEvent(submissions=200, seed=1).dump(tmp_path)
+
+    for input_file in [
+        tmp_path / "submissions_latest.json",
+        to_jsonl(tmp_path / "submissions_latest.json", tmp_path / "submissions.jsonl"),
+    ]:
+        submissions = Parse.publishable_submissions(input_file)
+        assert Parse.publishable_submissions(input_file, fast=True) == submissions
+
+    speakers = Parse.publishable_speakers(
+        tmp_path / "speakers_latest.json", submissions.keys()
+    )
+    assert (
+        Parse.publishable_speakers(
+            tmp_path / "speakers_latest.json", submissions.keys(), fast=True
+        )
+        == speakers
+    )
+
+
+def test_lazy_schedule(tmp_path) -> None:
+    SyntheticEvent(submissions=100, seed=2).dump(tmp_path)
+
+    schedule = Parse.schedule(tmp_path / "schedule_latest.json")
+    lazy_schedule = Parse.schedule(tmp_path / "schedule_latest.json", lazy=True)
+
+    assert lazy_schedule.breaks == schedule.breaks
+    assert "slots" not in lazy_schedule.__dict__
+    assert lazy_schedule.slots == schedule.slots
+
+
+def test_prefilter(tmp_path) -> None:
+    SyntheticEvent(submissions=200, seed=2).dump(tmp_path)
+    jsonl_file = to_jsonl(
+        tmp_path / "submissions_latest.json", tmp_path / "submissions.jsonl"
+    )
+
+    submissions = Parse.publishable_submissions(
+        tmp_path / "submissions_latest.json", prefilter=False
+    )
+    for input_file in [tmp_path / "submissions_latest.json", jsonl_file]:
+        for fast in [False, True]:
+            assert (
+                Parse.publishable_submissions(input_file, fast=fast, prefilter=True)
+                == submissions
+            )
+
+    speakers = Parse.publishable_speakers(
+        tmp_path / "speakers_latest.json", submissions.keys(), prefilter=False
+    )
+    for fast in [False, True]:
+        assert (
+            Parse.publishable_speakers(
+                tmp_path / "speakers_latest.json",
+                submissions.keys(),
+                fast=fast,
+                prefilter=True,
+            )
+            == speakers
+        )
+
+
+def test_skip_submission_line() -> None:
+    rejected = b'{"code": "A", "speakers": [], "state": "rejected", "title": "x"}\n'
+    confirmed = (
+        b'{"code": "A", "state": "confirmed", "title": "\\"state\\": \\"rejected\\""}\n'
+    )
+    nested = (
+        b'{"code": "A", "speakers": [{"state": "rejected"}], "state": "confirmed"}\n'
+    )
+
+    assert Projection.skip_submission_line(rejected)
+    assert not Projection.skip_submission_line(confirmed)
+    assert not Projection.skip_submission_line(nested)
@@ -0,0 +1,69 @@
+import src.utils.parse
+from src.utils.parse import Parse
+from src.utils.parse_cache import ParseCache
+from src.utils.synthetic_event import SyntheticEvent
+
+event = SyntheticEvent(submissions=50, answers=1, seed=8)
+
+
+def test_parse_cache_reuses_unchanged_files(tmp_path) -> None:
+    event.dump(tmp_path / "raw")
+    input_file = tmp_path / "raw" / "submissions_latest.json"
+    cache = ParseCache(tmp_path / "cache")
+    calls = []
+
+    def parse():
+        calls.append(input_file)
+        return Parse.publishable_submissions(input_file)
+
+    first = cache.get_or_parse("submissions", input_file, parse)
+    second = cache.get_or_parse("submissions", input_file, parse)
+
+    assert len(calls) == 1
+    assert cache.hits == ["submissions"]
+    assert first == second
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_parse_cache_invalidation(tmp_path, monkeypatch) -> None:
+    input_file = tmp_path / "input.json"
+    input_file.write_text("[1]")
+    cache = ParseCache(tmp_path / "cache")
+
+    assert cache.get_or_parse("numbers", input_file, lambda: 1) == 1
+    # Same file, same schema, same extra keys
+    assert cache.get_or_parse("numbers", input_file, lambda: 2) == 1
+
+    # Changed extra keys
+    assert cache.get_or_parse("numbers", input_file, lambda: 3, "A,B") == 3
+
+    # Changed file
+    input_file.write_text("[2]")
+    assert cache.get_or_parse("numbers", input_file, lambda: 4, "A,B") == 4
+
+    # Changed schema
+    monkeypatch.setattr(ParseCache, "schema_version", lambda: "next")
+    assert cache.get_or_parse("numbers", input_file, lambda: 5, "A,B") == 5
+
+    # Only the latest entry is kept
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_parse_cache_disabled(tmp_path) -> None:
+    input_file = tmp_path / "input.json"
+    input_file.write_text("[1]")
+    cache = ParseCache(tmp_path / "cache", enabled=False)
+
+    assert cache.get_or_parse("numbers", input_file, lambda: 1) == 1
+    assert cache.get_or_parse("numbers", input_file, lambda: 2) == 2
+    assert not (tmp_path / "cache").exists()
+
+
+def test_parse_cache_schema_covers_the_parsing_code() -> None:
+    # The modules of the classes Parse uses (models, Projection, Utils, ...)
+    used = {
+        value.__module__
+        for value in vars(src.utils.parse).values()
+        if getattr(value, "__module__", "").startswith("src.")
+    }
+    assert used <= {module.__name__ for module in ParseCache.schema_modules}
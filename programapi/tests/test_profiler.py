@@ -0,0 +1,63 @@
+import json
+import pstats
+import tracemalloc
+from pathlib import Path
+
+from src.utils.profiler import Profiler
+
+
+def test_stages_are_not_recorded_without_a_profiler() -> None:
+    with Profiler.stage("Nothing"):
+        pass
+
+    assert Profiler.active is None
+
+
+def test_profiler(tmp_path: Path) -> None:
+    profiler = Profiler(pstats_dir=tmp_path / "pstats")
+    profiler.start()
+    try:
+        with Profiler.stage("Outer"):
+            with Profiler.stage("Inner"):
+                kept = [[i] for i in range(10_000)]
+            with Profiler.stage("Second inner"):
+                sum(range(10_000))
+    finally:
+        profiler.stop()
+    profiler.write(tmp_path / "report.json")
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    outer, inner, second_inner = report["stages"]
+    assert [s["name"] for s in report["stages"]] == ["Outer", "Inner", "Second inner"]
+    assert [s["depth"] for s in report["stages"]] == [0, 1, 1]
+
+    # The figures of a stage include the ones of its inner stages
+    assert inner["new_objects"] > len(kept) // 2 > second_inner["new_objects"]
+    assert outer["new_objects"] >= inner["new_objects"]
+    assert outer["memory_peak"] >= max(
+        inner["memory_peak"], second_inner["memory_peak"]
+    )
+    assert outer["wall_time"] >= inner["wall_time"] + second_inner["wall_time"]
+    assert report["wall_time"] >= outer["wall_time"]
+
+    # Each stage has its own cProfile, without the ones of its inner stages
+    functions = {
+        stage["name"]: {f[2] for f in pstats.Stats(stage["pstats"]).stats}
+        for stage in report["stages"]
+    }
+    assert "<built-in method builtins.sum>" in functions["Second inner"]
+    assert "<built-in method builtins.sum>" not in functions["Outer"]
+
+
+def test_profiler_without_memory() -> None:
+    profiler = Profiler(memory=False)
+    profiler.start()
+    try:
+        with Profiler.stage("Stage"):
+            sum(range(10_000))
+    finally:
+        profiler.stop()
+
+    (stage,) = profiler.stages
+    assert sorted(stage) == ["cpu_time", "depth", "name", "wall_time"]
+    assert not tracemalloc.is_tracing()
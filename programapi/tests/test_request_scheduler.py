@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from src.utils.download import Download
+from src.utils.fake_pretalx import FakePretalx
+from src.utils.request_scheduler import PretalxAPIError, RequestScheduler
+
+RECORDS = [{"code": f"S{i:04}"} for i in range(240)]
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "result"),
+    [
+        (None, None),
+        ("", None),
+        ("3", 3.0),
+        ("-1", 0.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+        ("garbage", None),
+    ],
+)
+def test_retry_after_seconds(retry_after: str | None, result: float | None) -> None:
+    assert RequestScheduler.retry_after_seconds(retry_after) == result
+
+
+def test_download_survives_rate_limits() -> None:
+    scheduler = RequestScheduler(max_concurrency=8, backoff_base=0.01)
+
+    with FakePretalx(
+        {"submissions": RECORDS}, page_size=10, rate_limit_every=4, retry_after="0"
+    ) as fake:
+        download = Download(fake.url, headers={}, scheduler=scheduler)
+        results = asyncio.run(download.paginated("submissions?questions=all"))
+
+    assert results == RECORDS
+    stats = scheduler.stats["submissions"]
+    assert stats.rate_limited == fake.rate_limited > 0
+    assert stats.retries == fake.rate_limited
+    assert stats.requests == fake.requests
+    assert scheduler.limit < scheduler.max_concurrency
+
+
+def test_download_gives_up_after_max_retries() -> None:
+    scheduler = RequestScheduler(max_concurrency=2, max_retries=2, backoff_base=0.01)
+
+    with FakePretalx(
+        {"submissions": RECORDS}, rate_limit_every=1, retry_after="0"
+    ) as fake:
+        download = Download(fake.url, headers={}, scheduler=scheduler)
+        with pytest.raises(PretalxAPIError) as e:
+            asyncio.run(download.paginated("submissions"))
+
+    assert e.value.status_code == 429
+    assert fake.requests == 3
+
+
+def test_download_does_not_retry_client_errors() -> None:
+    scheduler = RequestScheduler(max_concurrency=2, backoff_base=0.01)
+
+    with FakePretalx({"submissions": RECORDS}) as fake:
+        download = Download(fake.url, headers={}, scheduler=scheduler)
+        with pytest.raises(PretalxAPIError) as e:
+            asyncio.run(download.paginated("speakers"))
+
+    assert e.value.status_code == 404
+    assert fake.requests == 1
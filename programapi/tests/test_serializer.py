@@ -0,0 +1,117 @@
+import json
+from typing import ClassVar, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from src.models.europython import EuroPythonSession, EuroPythonSpeaker, Schedule
+from src.utils.serializer import Serializer
+from tests.conftest import TransformedEvent
+
+
+def sort_nested(data, sort_keys=("start", "code", "title", "name")):
+    """
+    The original, generic, sorting of the output
+    that the rules of the models have to give the same results as
+    """
+    if isinstance(data, dict):
+        return {key: sort_nested(value) for key, value in sorted(data.items())}
+    elif isinstance(data, list):
+        if all(isinstance(item, dict) for item in data):
+            return sorted(
+                (sort_nested(item) for item in data),
+                key=lambda item: tuple(item.get(key, "") for key in sort_keys),
+            )
+        return sorted(sort_nested(item) for item in data)
+    return data
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        [],
+        {"b": 1, "a": [3, 1, 2], "c": {"z": None, "y": True, "x": False}},
+        {"name": "Ada Lovelace ✨", "quote": 'A "quoted"\nline\t '},
+        [1.5, 0.1, 1e-07, 1e300, -0.0, 2, float("nan"), float("-inf")],
+        [{"b": [{"c": []}, {}]}, [[1, "2"], {}]],
+    ],
+)
+def test_serializer_is_json_dump_with_sorted_keys(data) -> None:
+    assert Serializer.dumps(data) == json.dumps(data, indent=2, sort_keys=True)
+
+
+def test_lists_without_rules_are_in_insertion_order() -> None:
+    data = {"rooms": ["B", "A"], "events": [{"start": "10:00"}, {"start": "09:00"}]}
+
+    assert Serializer.dumps(data) == json.dumps(data, indent=2, sort_keys=True)
+
+
+def test_rules_are_the_ones_of_the_models() -> None:
+    rule = Serializer.rule(Schedule)
+    day = rule.fields["days"].items
+
+    assert day.fields["rooms"].order == ()
+    assert day.fields["events"].order == ("start", "code", "title")
+    assert day.fields["events"].items.fields["speakers"].order == ("code",)
+    assert day.fields["events"].items.fields["rooms"].order == ()
+    assert Serializer.rule(dict[str, EuroPythonSpeaker]).items.fields.keys() == {
+        "submissions"
+    }
+
+
+def test_rules_of_optional_lists() -> None:
+    class Item(BaseModel):
+        list_order: ClassVar[dict[str, tuple[str, ...]]] = {"tags": ()}
+
+        tags: list[str]
+
+    class Container(BaseModel):
+        list_order: ClassVar[dict[str, tuple[str, ...]]] = {"items": ("name",)}
+
+        name: str = ""
+        items: list[Item] | None = None
+        other: Optional[list[Item]] = None
+        either: list[Item] | dict[str, Item] | None = None
+
+    rule = Serializer.rule(Container)
+    assert rule.fields["items"].order == ("name",)
+    for name in ["items", "other", "either"]:
+        assert rule.fields[name].items.fields["tags"].order == ()
+
+    data = {
+        "items": [{"name": "b", "tags": ["y", "x"]}, {"name": "a", "tags": ["z"]}],
+        "other": [{"tags": ["b", "a"]}],
+        "either": {"k": {"tags": ["d", "c"]}},
+    }
+    assert json.loads(Serializer.dumps(data, Container)) == {
+        "items": [{"name": "a", "tags": ["z"]}, {"name": "b", "tags": ["x", "y"]}],
+        "other": [{"tags": ["a", "b"]}],
+        "either": {"k": {"tags": ["c", "d"]}},
+    }
+
+
+def test_rules_give_the_generic_order(transformed_event: TransformedEvent) -> None:
+    ep_sessions = transformed_event.ep_sessions
+    ep_speakers = transformed_event.ep_speakers
+    ep_schedule = transformed_event.ep_schedule
+
+    for data, data_type in [
+        (
+            {k: v.model_dump(mode="json") for k, v in ep_sessions.items()},
+            dict[str, EuroPythonSession],
+        ),
+        (
+            {k: v.model_dump(mode="json") for k, v in ep_speakers.items()},
+            dict[str, EuroPythonSpeaker],
+        ),
+        (ep_schedule.model_dump(mode="json"), Schedule),
+    ]:
+        assert Serializer.dumps(data, data_type) == json.dumps(
+            sort_nested(data), indent=2
+        )
+
+
+def test_serializer_rejects_unknown_types() -> None:
+    with pytest.raises(TypeError):
+        Serializer.dumps({"a": object()})
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.utils.output_writer import OutputWriter
+from src.utils.shards import Shards
+from tests.conftest import TransformedEvent
+
+
+def test_shards(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    transformed_event: TransformedEvent,
+) -> None:
+    public_path = tmp_path / "public"
+    shutil.copytree(transformed_event.public_path, public_path)
+    # A session is removed below
+    ep_sessions = dict(transformed_event.ep_sessions)
+    ep_speakers = transformed_event.ep_speakers
+    ep_schedule = transformed_event.ep_schedule
+
+    writer = OutputWriter(public_path)
+    shard_writer = Shards.write(writer, ep_sessions, ep_speakers, ep_schedule)
+    shard_writer.save_manifest()
+    writer.save_manifest()
+
+    def load(name: str):
+        return json.loads((public_path / name).read_text())
+
+    # The files are the parts of the files with all of them
+    index = load("index.json")
+    for kind in ["sessions", "speakers"]:
+        assert index[kind].keys() == load(f"{kind}.json").keys()
+        for code, entry in index[kind].items():
+            assert load(entry["path"]) == load(f"{kind}.json")[code]
+
+    days = load("schedule.json")["days"]
+    assert index["schedule"].keys() == days.keys()
+    for day, day_entry in index["schedule"].items():
+        assert load(day_entry["path"]) == days[day]
+        assert day_entry["rooms"].keys() == set(days[day]["rooms"])
+        for room, room_entry in day_entry["rooms"].items():
+            assert load(room_entry["path"])["events"] == [
+                event for event in days[day]["events"] if room in event["rooms"]
+            ]
+
+    # The index has the hashes of the files, the manifest only the ones of the index
+    # and of the files with all of them
+    for entry in index["sessions"].values():
+        content = (public_path / entry["path"]).read_bytes()
+        assert entry["sha256"] == hashlib.sha256(content).hexdigest()
+    assert load("manifest.json")["files"].keys() == {
+        "index.json",
+        "sessions.json",
+        "speakers.json",
+        "schedule.json",
+    }
+
+    # The files are in their own manifest
+    files = load(Shards.manifest_file)["files"]
+    assert files.keys() == set(shard_writer.written)
+    assert files[entry["path"]]["sha256"] == entry["sha256"]
+
+    # The files of the sessions that are gone are removed, and the others are
+    # compared with the manifest, without reading them again
+    removed_code = next(iter(ep_sessions))
+    del ep_sessions[removed_code]
+    writer = OutputWriter(public_path)
+    hashed = []
+    file_hash = OutputWriter.file_hash
+    monkeypatch.setattr(
+        OutputWriter,
+        "file_hash",
+        lambda path: hashed.append(Path(path)) or file_hash(path),
+    )
+    shard_writer = Shards.write(writer, ep_sessions, ep_speakers, ep_schedule)
+    shard_writer.save_manifest()
+
+    assert [path for path in hashed if path.parent != public_path] == []
+
+    assert shard_writer.written == []
+    assert len(shard_writer.unchanged) == len(files) - 1
+    assert f"sessions/{removed_code}.json" not in load(Shards.manifest_file)["files"]
+    assert not (public_path / "sessions" / f"{removed_code}.json").exists()
+    assert removed_code not in load("index.json")["sessions"]
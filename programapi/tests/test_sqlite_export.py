@@ -0,0 +1,90 @@
+import json
+import shutil
+import sqlite3
+from pathlib import Path
+
+from src.utils.output_writer import OutputWriter
+from src.utils.sqlite_export import SQLiteExport
+from tests.conftest import TransformedEvent
+
+
+def test_sqlite_export(tmp_path: Path, transformed_event: TransformedEvent) -> None:
+    public_path = tmp_path / "public"
+    shutil.copytree(transformed_event.public_path, public_path)
+    ep_sessions = transformed_event.ep_sessions
+    ep_speakers = transformed_event.ep_speakers
+    ep_schedule = transformed_event.ep_schedule
+
+    writer = OutputWriter(public_path)
+    assert SQLiteExport.write(writer, ep_sessions, ep_speakers, ep_schedule)
+
+    database_file = public_path / SQLiteExport.file_name
+    connection = sqlite3.connect(f"file:{database_file}?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+
+    # The rows are the ones of the JSON files
+    sessions = json.loads((public_path / "sessions.json").read_text())
+    rows = {row["code"]: row for row in connection.execute("SELECT * FROM sessions")}
+    assert rows.keys() == sessions.keys()
+    for code, session in sessions.items():
+        for column in ["title", "slug", "room", "start", "end", "next_session"]:
+            assert rows[code][column] == session[column]
+        assert json.loads(rows[code]["resources"] or "null") == session["resources"]
+        assert {
+            row["speaker_code"]
+            for row in connection.execute(
+                "SELECT speaker_code FROM session_speakers WHERE session_code = ?",
+                (code,),
+            )
+        } == set(session["speakers"])
+        for kind, field in [
+            ("parallel", "sessions_in_parallel"),
+            ("after", "sessions_after"),
+            ("before", "sessions_before"),
+        ]:
+            assert {
+                row["related_code"]
+                for row in connection.execute(
+                    "SELECT related_code FROM relationships "
+                    "WHERE session_code = ? AND kind = ?",
+                    (code, kind),
+                )
+            } == set(session[field] or [])
+    assert connection.execute("SELECT count(*) FROM speakers").fetchone()[0] == len(
+        ep_speakers
+    )
+
+    days = json.loads((public_path / "schedule.json").read_text())["days"]
+    breaks = [
+        (event["title"], room, event["start"])
+        for day in days.values()
+        for event in day["events"]
+        if event["event_type"] == "break"
+        for room in event["rooms"]
+    ]
+    assert breaks
+    assert sorted(breaks) == sorted(
+        tuple(row)
+        for row in connection.execute("SELECT title, room, start FROM breaks")
+    )
+
+    # The queries of a room between two times and of a speaker use the indexes
+    room, start = connection.execute(
+        "SELECT room, start FROM sessions WHERE room IS NOT NULL ORDER BY start"
+    ).fetchone()
+    query = "SELECT code FROM sessions WHERE room = ? AND start >= ? AND start < ?"
+    plan = connection.execute(f"EXPLAIN QUERY PLAN {query}", (room, start, "9999"))
+    assert "sessions_room_start" in str([tuple(row) for row in plan])
+    assert connection.execute(query, (room, start, "9999")).fetchall()
+    plan = connection.execute(
+        "EXPLAIN QUERY PLAN SELECT session_code FROM session_speakers "
+        "WHERE speaker_code = ?",
+        ("ABC",),
+    )
+    assert "session_speakers_speaker" in str([tuple(row) for row in plan])
+    connection.close()
+
+    # The same data gives the same database, which is kept
+    writer = OutputWriter(public_path)
+    assert not SQLiteExport.write(writer, ep_sessions, ep_speakers, ep_schedule)
+    assert writer.unchanged == [SQLiteExport.file_name]
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from collections import Counter
+
+import pytest
+
+from src.config import Config
+from src.misc import Room
+from src.utils.download import Download
+from src.utils.fake_pretalx import FakePretalx
+from src.utils.request_scheduler import RequestScheduler
+from src.utils.synthetic_event import SyntheticEvent
+from tests.conftest import TransformedEvent
+
+
+def test_synthetic_event_goes_through_the_pipeline(
+    transformed_event: TransformedEvent,
+) -> None:
+    submissions = transformed_event.submissions
+    schedule = transformed_event.schedule
+
+    assert len(submissions) == len(schedule.slots) > 100
+    assert {s.slot_count for s in submissions.values()} == {1, 2, 4}
+    assert {s.submission_type for s in submissions.values()} >= {
+        "Keynote",
+        "Announcements",
+        "Workshop",
+    }
+
+    assert all(s.mastodon_url for s in transformed_event.ep_speakers.values())
+    assert len(transformed_event.ep_schedule.days) > 1
+    sessions = json.loads((transformed_event.public_path / "sessions.json").read_text())
+    assert sessions.keys() == transformed_event.ep_sessions.keys()
+
+
+def test_larger_events_have_more_sessions_in_parallel() -> None:
+    def tracks_and_days(event: SyntheticEvent) -> tuple[int, set[str]]:
+        """
+        Returns the most sessions at the same time in a room, and the days
+        """
+        slots = [s["slot"] for s in event.schedule()["slots"]]
+        tracks = Counter((slot["room"]["en"], slot["start"]) for slot in slots)
+        return max(tracks.values()), {slot["start"][:10] for slot in slots}
+
+    assert tracks_and_days(SyntheticEvent(submissions=100, seed=1))[0] == 1
+    tracks, days = tracks_and_days(SyntheticEvent(submissions=2000, seed=1))
+    assert tracks > 1
+    assert days == {"2099-07-08", "2099-07-09", "2099-07-10"}
+
+    # With fewer tracks, the sessions that do not fit are left out
+    event = SyntheticEvent(submissions=2000, tracks=1, days=1, seed=1)
+    assert tracks_and_days(event) == (1, {"2099-07-08"})
+    assert 0 < len(event.schedule()["slots"]) < 100
+
+
+def test_synthetic_event_rooms() -> None:
+    with pytest.raises(ValueError):
+        SyntheticEvent(submissions=10, rooms=len(Room) + 1)
+
+
+def test_download_synthetic_event(
+    tmp_path, monkeypatch, transformed_event: TransformedEvent
+) -> None:
+    event = transformed_event.event
+    expected = transformed_event.raw_path
+    monkeypatch.setattr(Config, "raw_path", tmp_path / "downloaded")
+
+    with FakePretalx(
+        event.resources(),
+        page_size=20,
+        latency=0.001,
+        jitter=0.002,
+        error_rate=0.1,
+    ) as fake:
+        download = Download(
+            fake.url,
+            headers={},
+            scheduler=RequestScheduler(max_concurrency=4, backoff_base=0.01),
+        )
+        asyncio.run(download.all(["submissions", "speakers"]))
+
+    assert fake.errors > 0
+    for filename in ["submissions_latest.json", "speakers_latest.json"]:
+        assert (Config.raw_path / filename).read_bytes() == (
+            expected / filename
+        ).read_bytes()
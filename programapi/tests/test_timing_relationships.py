@@ -0,0 +1,261 @@
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models.pretalx import PretalxSubmission
+from src.utils.session_index import IntervalIndex
+from src.utils.timing_relationships import TimingRelationships
+
+
+class Reference:
+    """
+    The original, brute force, TimingRelationships
+    that the indexed one has to give the same results as
+    """
+
+    @staticmethod
+    def sessions_in_parallel(session, all_sessions):
+        return [
+            other.code
+            for other in all_sessions
+            if other.code != session.code
+            and other.start is not None
+            and session.start is not None
+            and other.start < session.end
+            and other.end > session.start
+        ]
+
+    @staticmethod
+    def sessions_after(session, all_sessions, sessions_in_parallel):
+        remaining = [
+            other
+            for other in sorted(all_sessions, key=lambda x: (x.start is None, x.start))
+            if other.start is not None
+            and other.start >= session.end
+            and other.code not in sessions_in_parallel
+            and other.code != session.code
+            and other.start.day == session.start.day
+            and not other.submission_type == session.submission_type == "Announcements"
+        ]
+        seen_rooms = set()
+        unique = []
+        for other in remaining:
+            if other.room not in seen_rooms:
+                unique.append(other)
+                seen_rooms.add(other.room)
+        if any(s.submission_type == "Keynote" for s in unique):
+            unique = [s for s in unique if s.submission_type == "Keynote"]
+        return [s.code for s in unique]
+
+    @staticmethod
+    def sessions_before(session, all_sessions, sessions_in_parallel):
+        remaining = [
+            other
+            for other in sorted(
+                all_sessions, key=lambda x: (x.start is None, x.start), reverse=True
+            )
+            if other.start is not None
+            and other.code not in sessions_in_parallel
+            and other.start <= session.start
+            and other.code != session.code
+            and other.start.day == session.start.day
+            and other.submission_type != "Announcements"
+        ]
+        seen_rooms = set()
+        unique = []
+        for other in remaining:
+            if other.room not in seen_rooms:
+                unique.append(other)
+                seen_rooms.add(other.room)
+        return [s.code for s in unique]
+
+    @staticmethod
+    def prev_or_next_session(session, sessions_before_or_after, all_sessions):
+        if not sessions_before_or_after:
+            return None
+        candidates = [s for s in all_sessions if s.code in sessions_before_or_after]
+        for other in candidates:
+            if other.room == session.room or other.submission_type == "Keynote":
+                return other.code
+        return None
+
+    @staticmethod
+    def compute(all_sessions):
+        result = {}
+        for session in all_sessions:
+            if not session.start or not session.end:
+                continue
+            parallel = Reference.sessions_in_parallel(session, all_sessions)
+            after = Reference.sessions_after(session, all_sessions, parallel)
+            before = Reference.sessions_before(session, all_sessions, parallel)
+            result[session.code] = (
+                parallel,
+                after,
+                before,
+                Reference.prev_or_next_session(session, after, all_sessions),
+                Reference.prev_or_next_session(session, before, all_sessions),
+            )
+        return result
+
+
+def random_sessions(count: int, seed: int) -> list[PretalxSubmission]:
+    """
+    Sessions on a coarse grid of times, to get many ties and overlaps,
+    over days in two months that share their day of the month
+    """
+    rng = random.Random(seed)
+    first_days = [
+        datetime(2099, 7, 8, tzinfo=timezone.utc),
+        datetime(2099, 7, 9, tzinfo=timezone.utc),
+        datetime(2099, 8, 8, tzinfo=timezone.utc),
+    ]
+    sessions = []
+    for i in range(count):
+        start = rng.choice(first_days) + timedelta(minutes=30 * rng.randrange(16))
+        scheduled = rng.random() > 0.05
+        sessions.append(
+            PretalxSubmission.model_construct(
+                code=f"S{i:04}",
+                submission_type=rng.choice(
+                    ["Talk", "Talk", "Talk", "Keynote", "Announcements", "Workshop"]
+                ),
+                room=rng.choice(["A", "B", "C", None]),
+                start=start if scheduled else None,
+                end=(
+                    start + timedelta(minutes=rng.choice([0, 30, 45, 60, 180]))
+                    if scheduled
+                    else None
+                ),
+            )
+        )
+    return sessions
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_interval_index(seed: int) -> None:
+    sessions = random_sessions(300, seed)
+    index = IntervalIndex(sessions)
+
+    for session in sessions:
+        if session.start is None:
+            continue
+        assert TimingRelationships.compute_sessions_in_parallel(
+            session, sessions, index
+        ) == Reference.sessions_in_parallel(session, sessions)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_timing_relationships_match_reference(seed: int) -> None:
+    sessions = random_sessions(300, seed)
+    relationships = TimingRelationships.compute(sessions)
+
+    for code, expected in Reference.compute(sessions).items():
+        assert (
+            relationships.get_sessions_in_parallel(code),
+            relationships.get_sessions_after(code),
+            relationships.get_sessions_before(code),
+            relationships.get_next_session(code),
+            relationships.get_prev_session(code),
+        ) == expected
+
+
+def test_prev_or_next_session_with_repeated_codes() -> None:
+    sessions = random_sessions(60, seed=0)
+    # The same code in another room, before the session in the same room
+    sessions += [s.model_copy(update={"room": "D"}) for s in sessions[:30]]
+    sessions.reverse()
+    sessions_by_code = TimingRelationships.index_by_code(sessions)
+
+    for session in sessions:
+        codes = [s.code for s in sessions[::7]]
+        assert TimingRelationships.compute_prev_or_next_session(
+            session, codes, sessions, sessions_by_code
+        ) == Reference.prev_or_next_session(session, codes, sessions)
+
+
+def test_timing_relationships_are_independent() -> None:
+    sessions = random_sessions(100, seed=1)
+    other_sessions = random_sessions(100, seed=2)
+
+    relationships = TimingRelationships.compute(sessions)
+    expected = pickle.dumps(relationships)
+    other_relationships = TimingRelationships.compute(other_sessions)
+
+    assert pickle.dumps(relationships) == expected
+    assert relationships.all_sessions_after != other_relationships.all_sessions_after
+
+    # They can be computed in, and returned from, other processes
+    with ProcessPoolExecutor(2) as executor:
+        assert [
+            pickle.dumps(r)
+            for r in executor.map(TimingRelationships.compute, [sessions])
+        ] == [expected]
+
+
+def edit_sessions(
+    sessions: list[PretalxSubmission], rng: random.Random
+) -> tuple[list[PretalxSubmission], set[str]]:
+    """
+    Moves, edits, unschedules, removes and adds a few random sessions
+    """
+    sessions = list(sessions)
+    changed_codes = set()
+    for _ in range(rng.randint(1, 4)):
+        position = rng.randrange(len(sessions))
+        session = sessions[position]
+        edit = rng.choice(["move", "room", "type", "unschedule", "remove", "add"])
+        if edit == "move" and session.start is not None:
+            delta = timedelta(minutes=30 * rng.randint(-8, 8), days=rng.randint(-1, 1))
+            sessions[position] = session.model_copy(
+                update={"start": session.start + delta, "end": session.end + delta}
+            )
+        elif edit == "room":
+            sessions[position] = session.model_copy(
+                update={"room": rng.choice(["A", "B", "C", "D", None])}
+            )
+        elif edit == "type":
+            sessions[position] = session.model_copy(
+                update={
+                    "submission_type": rng.choice(["Talk", "Keynote", "Announcements"])
+                }
+            )
+        elif edit == "unschedule":
+            sessions[position] = session.model_copy(update={"start": None, "end": None})
+        elif edit == "remove":
+            del sessions[position]
+        else:
+            session = random_sessions(1, rng.random())[0]
+            session = session.model_copy(update={"code": f"N{len(changed_codes)}"})
+            sessions.insert(position, session)
+        changed_codes.add(session.code)
+
+    return sessions, changed_codes
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_incremental_update_is_a_full_recompute(seed: int) -> None:
+    rng = random.Random(seed)
+    sessions = random_sessions(120, seed)
+    relationships = TimingRelationships.compute(sessions)
+
+    for _ in range(3):
+        sessions, changed_codes = edit_sessions(sessions, rng)
+        recomputed = relationships.update(sessions, changed_codes)
+
+        assert len(recomputed) < len(sessions)
+        assert pickle.dumps(relationships) == pickle.dumps(
+            TimingRelationships.compute(sessions)
+        )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_numpy_backend(seed: int) -> None:
+    pytest.importorskip("numpy")
+    sessions = random_sessions(300, seed)
+
+    assert pickle.dumps(
+        TimingRelationships.compute(sessions, backend="numpy")
+    ) == pickle.dumps(TimingRelationships.compute(sessions, backend="python"))
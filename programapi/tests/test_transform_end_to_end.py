@@ -12,10 +12,11 @@ youtube_data = Parse.youtube("./data/examples/pretalx/youtube.json")
 
 
 def test_e2e_sessions() -> None:
-    TimingRelationships.compute(pretalx_submissions.values())
+    timing_relationships = TimingRelationships.compute(pretalx_submissions.values())
 
     ep_sessions = Transform.pretalx_submissions_to_europython_sessions(
         pretalx_submissions,
+        timing_relationships,
         youtube_data,
     )
     ep_sessions_dump = {